@@ -0,0 +1,109 @@
+import importlib
+import threading
+
+""""Backend registry documentation.
+
+Optional and heavy dependencies (numpy, numba, ...) are never imported when
+the solver modules are imported. They are registered here by name with a
+loader and imported the first time get_backend asks for them, so
+"import lin_sys" only pays for the standard library and hosts without the
+optional packages can still use everything that doesn't need them.
+
+Examples:
+    if is_available('numpy'):
+        np = get_backend('numpy')
+
+    register_backend('cupy', lambda: importlib.import_module('cupy'))
+
+"""
+
+
+BACKEND_NOT_REGISTERED_MSG = 'No backend registered with the name {}'
+BACKEND_UNAVAILABLE_MSG = 'The backend {} is not available: {}'
+
+_loaders = {}
+_loaded = {}
+_failed = {}
+_lock = threading.RLock()
+
+
+def register_backend(name, loader):
+    """Register a backend. Nothing is imported until it is requested.
+
+        Args:
+            name(str): The name of the backend.
+
+            loader(callable): Called without arguments the first time the
+                              backend is requested. Returns the backend or
+                              raises ImportError.
+    """
+    with _lock:
+        _loaders[name] = loader
+        _loaded.pop(name, None)
+        _failed.pop(name, None)
+
+
+def register_module(name, module_name=None):
+    """Register a backend that is a module imported by name.
+
+        Args:
+            name(str): The name of the backend.
+
+            module_name(str): The module to import. Defaults to name.
+    """
+    register_backend(name, lambda: importlib.import_module(module_name or name))
+
+
+def get_backend(name):
+    """Returns a backend, loading it the first time.
+
+        Args:
+            name(str): The name of the backend.
+
+        Returns:
+            The object returned by the loader of the backend.
+
+        Raises:
+            KeyError: If no backend is registered with that name.
+
+            ImportError: If the backend can't be loaded.
+    """
+    if name in _loaded:
+        return _loaded[name]
+    with _lock:
+        if name in _loaded:
+            return _loaded[name]
+        if name not in _loaders:
+            raise KeyError(BACKEND_NOT_REGISTERED_MSG.format(name))
+        if name in _failed:
+            raise ImportError(BACKEND_UNAVAILABLE_MSG.format(name, _failed[name]))
+        try:
+            backend = _loaders[name]()
+        except ImportError as e:
+            _failed[name] = e
+            raise ImportError(BACKEND_UNAVAILABLE_MSG.format(name, e))
+        _loaded[name] = backend
+        return backend
+
+
+def is_available(name):
+    """Returns True if the backend can be loaded. Loads it if it can."""
+    try:
+        get_backend(name)
+        return True
+    except (KeyError, ImportError):
+        return False
+
+
+def is_loaded(name):
+    """Returns True if the backend has already been loaded."""
+    return name in _loaded
+
+
+def registered_backends():
+    """Returns the names of the registered backends, loaded or not."""
+    return sorted(_loaders)
+
+
+register_module('numpy')
+register_module('numba')
@@ -0,0 +1,181 @@
+import numpy as np
+
+""""BatchLUFactorization class documentation.
+
+The LU factorization with partial pivoting of a stack of small matrices. It
+does the same elimination as lu.LUFactorization but every step is vectorized
+across the stack, so a batch of thousands of 3x3 or 4x4 matrices costs a
+handful of array operations per column instead of a Python loop per matrix.
+
+Examples:
+    lu = BatchLUFactorization(np.random.rand(10000, 4, 4))
+
+    dets = lu.determinant()   # shape (10000,)
+    invs = lu.inverse()       # shape (10000, 4, 4), nan for singular matrices
+    ranks = lu.rank()         # shape (10000,)
+
+
+Attributes:
+    permutation(numpy.ndarray): Shape (batch, rows). permutation[b, i] is the
+        row of matrix b that ended in row i.
+
+    tolerance(float): Pivots not bigger than tolerance times the largest
+        absolute value of their matrix are considered zero.
+
+"""
+
+
+class BatchLUFactorization(object):
+
+    NOT_SQUARE_MSG = 'The matrices are not square'
+    WRONG_SHAPE_MSG = 'Expected an array of shape (batch, rows, cols)'
+
+    def __init__(self, matrices, tolerance=1e-10):
+        """Factorize every matrix of the stack.
+
+            Args:
+                matrices(array_like): Shape (batch, rows, cols).
+
+                tolerance(float): Relative tolerance used to detect zero pivots.
+        """
+        a = np.array(matrices, dtype=float)
+        if a.ndim != 3:
+            raise Exception(self.WRONG_SHAPE_MSG)
+        self.tolerance = tolerance
+        self._lu = a
+        self.permutation = np.tile(np.arange(a.shape[1]), (a.shape[0], 1))
+        self._sign = np.ones(a.shape[0])
+        self._rank = np.zeros(a.shape[0], dtype=int)
+        self._factorize()
+
+    def _factorize(self):
+        a = self._lu
+        batch, m, n = a.shape
+        batch_idx = np.arange(batch)
+        row_idx = np.arange(m)
+        scale = np.abs(a).reshape(batch, -1).max(axis=1, initial=0.0)
+        threshold = self.tolerance * np.where(scale > 0, scale, 1.0)
+        r = self._rank
+
+        for c in range(n):
+            candidates = row_idx[None, :] >= r[:, None]
+            magnitudes = np.where(candidates, np.abs(a[:, :, c]), -1.0)
+            p = magnitudes.argmax(axis=1)
+            ok = (r < m) & (magnitudes[batch_idx, p] > threshold)
+            if not ok.any():
+                continue
+
+            b, rb, pb = batch_idx[ok], r[ok], p[ok]
+            swapped = pb != rb
+            rows_r = a[b, rb].copy()
+            a[b, rb] = a[b, pb]
+            a[b, pb] = rows_r
+            perm_r = self.permutation[b, rb].copy()
+            self.permutation[b, rb] = self.permutation[b, pb]
+            self.permutation[b, pb] = perm_r
+            self._sign[b[swapped]] *= -1
+
+            pivot_rows = a[b, rb]
+            below = row_idx[None, :] > rb[:, None]
+            factors = np.where(below, a[b, :, c] / pivot_rows[:, c][:, None], 0.0)
+            a[b, :, c + 1:] -= factors[:, :, None] * pivot_rows[:, None, c + 1:]
+            a[b, :, c] = np.where(below, factors, a[b, :, c])
+            r[ok] += 1
+
+    def rank(self):
+        """Returns the rank of every matrix.
+
+            Returns:
+                numpy.ndarray: Shape (batch,).
+        """
+        return self._rank.copy()
+
+    def is_singular(self):
+        """Returns a mask of the singular matrices.
+
+            Returns:
+                numpy.ndarray: Shape (batch,) of bools.
+
+            Raises:
+                Exception: If the matrices are not square.
+        """
+        self._check_square()
+        return self._rank < self._lu.shape[1]
+
+    def determinant(self):
+        """Returns the determinant of every matrix.
+
+            Returns:
+                numpy.ndarray: Shape (batch,). Zero for singular matrices.
+
+            Raises:
+                Exception: If the matrices are not square.
+        """
+        singular = self.is_singular()
+        diagonal = np.diagonal(self._lu, axis1=1, axis2=2)
+        return np.where(singular, 0.0, self._sign * diagonal.prod(axis=1))
+
+    def solve(self, b):
+        """Solves every system of the stack.
+
+            Args:
+                b(array_like): Shape (batch, rows) or (batch, rows, k).
+
+            Returns:
+                numpy.ndarray: Same shape as b. Rows of singular matrices are nan.
+
+            Raises:
+                Exception: If the matrices are not square.
+        """
+        singular = self.is_singular()
+        b = np.asarray(b, dtype=float)
+        vector = b.ndim == 2
+        if vector:
+            b = b[:, :, None]
+
+        a = self._lu
+        n = a.shape[1]
+        y = np.take_along_axis(b, self.permutation[:, :, None], axis=1).copy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(1, n):
+                y[:, i] -= np.einsum('bk,bkj->bj', a[:, i, :i], y[:, :i])
+            for i in range(n - 1, -1, -1):
+                y[:, i] -= np.einsum('bk,bkj->bj', a[:, i, i + 1:], y[:, i + 1:])
+                y[:, i] /= a[:, i, i][:, None]
+        y[singular] = np.nan
+
+        if vector:
+            return y[:, :, 0]
+        return y
+
+    def inverse(self):
+        """Returns the inverse of every matrix.
+
+            Returns:
+                numpy.ndarray: Shape (batch, n, n). Singular matrices are nan.
+
+            Raises:
+                Exception: If the matrices are not square.
+        """
+        batch, n, _ = self._lu.shape
+        identity = np.broadcast_to(np.eye(n), (batch, n, n))
+        return self.solve(identity)
+
+    def _check_square(self):
+        if self._lu.shape[1] != self._lu.shape[2]:
+            raise Exception(self.NOT_SQUARE_MSG)
+
+
+def batch_determinant(matrices, tolerance=1e-10):
+    """Returns the determinants of a stack of matrices."""
+    return BatchLUFactorization(matrices, tolerance).determinant()
+
+
+def batch_inverse(matrices, tolerance=1e-10):
+    """Returns the inverses of a stack of matrices, nan for singular ones."""
+    return BatchLUFactorization(matrices, tolerance).inverse()
+
+
+def batch_rank(matrices, tolerance=1e-10):
+    """Returns the ranks of a stack of matrices."""
+    return BatchLUFactorization(matrices, tolerance).rank()
@@ -0,0 +1,104 @@
+import random
+import sys
+import time
+
+from decimal import Decimal
+
+from kernels import get_kernels
+from vector import Vector
+import backends
+
+""""Kernel benchmark.
+
+Times the Python and numba kernels of the kernels module on the same random
+systems and on batched dot products and norms of size vectors of size
+coordinates, next to the Decimal Vector.dot and Vector.module they stand in
+for. The numba kernels are called once before timing so the compilation isn't
+measured. Run it from the repository directory:
+
+    python bench_kernels.py [size] [repeats]
+
+"""
+
+
+SIZE = 200
+REPEATS = 5
+
+
+def random_rows(size, seed=0):
+    """Returns the augmented rows of a random size x size system."""
+    generator = random.Random(seed)
+    return [[generator.uniform(-10, 10) for _ in range(size + 1)] for _ in range(size)]
+
+
+def time_rref(kernels, rows, repeats):
+    """Returns the best time of kernels.rref on copies of rows."""
+    best = None
+    for _ in range(repeats):
+        a = kernels.as_matrix(rows)
+        pivots = kernels.as_pivots(len(rows))
+        start = time.perf_counter()
+        kernels.rref(a, pivots, 1e-10)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_reductions(kernels, rows, repeats):
+    """Returns the best time of dot_rows and norm_rows on rows."""
+    a = kernels.as_matrix(rows)
+    b = kernels.as_matrix(rows[::-1])
+    out = kernels.as_values(len(rows))
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        kernels.dot_rows(a, b, out)
+        kernels.norm_rows(a, out)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_decimal_reductions(rows, repeats):
+    """Returns the best time of the same reductions with Vector.dot and Vector.module."""
+    vectors = [Vector([Decimal(repr(value)) for value in row]) for row in rows]
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for u, v in zip(vectors, vectors[::-1]):
+            u.dot(v)
+        for u in vectors:
+            u.module()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(size=SIZE, repeats=REPEATS):
+    rows = random_rows(size)
+    names = ['python']
+    if backends.is_available('numba_kernels'):
+        names.append('numba')
+    else:
+        print('numba kernels not available, timing the Python kernels only')
+
+    results = {}
+    for name in names:
+        kernels = get_kernels(name)
+        time_rref(kernels, random_rows(3), 1)
+        time_reductions(kernels, random_rows(3), 1)
+        results[name] = (time_rref(kernels, rows, repeats), time_reductions(kernels, rows, repeats))
+        print('{:>7}: rref {}x{} {:.6f}s, dot+norm of {} rows {:.6f}s'.format(
+            name, size, size + 1, results[name][0], size, results[name][1]))
+    decimal = time_decimal_reductions(rows, repeats)
+    print('{:>7}: dot+norm of {} rows {:.6f}s'.format('decimal', size, decimal))
+
+    print('speedup of the Python kernels over Decimal: dot+norm {:.1f}x'.format(decimal / results['python'][1]))
+    if 'numba' in results:
+        print('speedup of numba over Python: rref {:.1f}x, dot+norm {:.1f}x'.format(
+            results['python'][0] / results['numba'][0], results['python'][1] / results['numba'][1]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:3]]))
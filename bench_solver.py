@@ -0,0 +1,223 @@
+import argparse
+import copy
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from vector import Vector
+from hyperplane import Hyperplane
+from lin_sys import LinearSystem
+from kernels import get_kernels
+import backends
+
+""""Solver scaling benchmark.
+
+Times compute_triangular_form, compute_rref and solve of lin_sys.LinearSystem,
+and solve_float with each available kernel set, on random, ill-conditioned,
+singular and sparse systems of growing size. Every phase is run once more
+under tracemalloc to record its peak memory and the blocks it left allocated.
+
+The report is JSON: one entry per kind of system, size, backend and phase,
+and the scaling exponent of time and memory against n fitted on a log-log
+scale. Given a previous report, entries that got slower or bigger than the
+threshold ratio are printed and the exit status is 1. Run it from the
+repository directory:
+
+    python bench_solver.py --sizes 4,8,16,32 --output report.json
+    python bench_solver.py --baseline report.json --threshold 1.3
+
+"""
+
+
+SIZES = (4, 8, 16, 32)
+REPEATS = 3
+THRESHOLD = 1.25
+KINDS = ('random', 'ill_conditioned', 'singular', 'sparse')
+
+DECIMAL_PHASES = (('triangular', lambda s: s.compute_triangular_form()),
+                  ('rref', lambda s: s.compute_rref()),
+                  ('solve', lambda s: s.solve()))
+
+
+def _system(rows):
+    return LinearSystem([Hyperplane(Vector([Decimal(repr(v)) for v in row[:-1]]), Decimal(repr(row[-1])))
+                         for row in rows])
+
+
+def random_system(n, generator):
+    """Returns a system with uniform random coefficients."""
+    return _system([[round(generator.uniform(-10, 10), 3) for _ in range(n + 1)] for _ in range(n)])
+
+
+def ill_conditioned_system(n, generator):
+    """Returns the Hilbert system of size n, whose condition number grows exponentially."""
+    return _system([[round(1.0 / (i + j + 1), 12) for j in range(n)] + [round(generator.uniform(-1, 1), 3)]
+                    for i in range(n)])
+
+
+def singular_system(n, generator):
+    """Returns a random system whose last equation is the sum of the first two."""
+    rows = [[round(generator.uniform(-10, 10), 3) for _ in range(n + 1)] for _ in range(n)]
+    if n > 2:
+        rows[-1] = [a + b for a, b in zip(rows[0], rows[1])]
+    return _system(rows)
+
+
+def sparse_system(n, generator, density=0.1):
+    """Returns a random system with a nonzero diagonal and about density of the other coefficients."""
+    rows = []
+    for i in range(n):
+        row = [round(generator.uniform(-10, 10), 3) if i == j or generator.random() < density else 0.0
+               for j in range(n)]
+        rows.append(row + [round(generator.uniform(-10, 10), 3)])
+    return _system(rows)
+
+
+GENERATORS = {'random': random_system, 'ill_conditioned': ill_conditioned_system,
+              'singular': singular_system, 'sparse': sparse_system}
+
+
+def phases():
+    """Returns (backend, phase, function) for every phase that can run here."""
+    result = [('decimal', name, function) for name, function in DECIMAL_PHASES]
+    names = ['python'] + (['numba'] if backends.is_available('numba_kernels') else [])
+    for name in names:
+        kernels = get_kernels(name)
+        kernels.rref(kernels.as_matrix([[1.0, 1.0]]), kernels.as_pivots(1), 1e-10)
+        result.append((name + '_kernels', 'solve_float', lambda s, k=kernels: s.solve_float(k)))
+    return result
+
+
+def measure(function, system, repeats):
+    """Returns the best time, the peak traced bytes and the retained blocks of function(system).
+
+        Each call gets a deep copy of the system, planes included, so cached
+        basepoints, patterns or factorizations don't carry over between runs.
+    """
+    best = None
+    for _ in range(repeats):
+        fresh = copy.deepcopy(system)
+        start = time.perf_counter()
+        function(fresh)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    fresh = copy.deepcopy(system)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = function(fresh)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    del result
+    return best, peak, retained
+
+
+def fit_exponent(sizes, values):
+    """Returns the slope of log(values) against log(sizes), or None with less than two points."""
+    points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if v > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run(sizes=SIZES, kinds=KINDS, repeats=REPEATS, seed=0):
+    """Runs the benchmark and returns the report as a dict."""
+    results = []
+    available = phases()
+    for kind in kinds:
+        for n in sizes:
+            system = GENERATORS[kind](n, random.Random(seed + n))
+            for backend, phase, function in available:
+                seconds, peak, retained = measure(function, system, repeats)
+                results.append({'kind': kind, 'n': n, 'backend': backend, 'phase': phase,
+                                'seconds': seconds, 'peak_bytes': peak, 'retained_blocks': retained})
+                print('{:>16} n={:<4} {:>14} {:>11}: {:.6f}s {:>10} bytes'.format(
+                    kind, n, backend, phase, seconds, peak), file=sys.stderr)
+
+    scaling = []
+    for kind in kinds:
+        for backend, phase, _ in available:
+            entries = [r for r in results if (r['kind'], r['backend'], r['phase']) == (kind, backend, phase)]
+            scaling.append({'kind': kind, 'backend': backend, 'phase': phase,
+                            'time_exponent': fit_exponent([r['n'] for r in entries], [r['seconds'] for r in entries]),
+                            'memory_exponent': fit_exponent([r['n'] for r in entries], [r['peak_bytes'] for r in entries])})
+
+    return {'python': platform.python_version(), 'sizes': list(sizes), 'repeats': repeats, 'seed': seed,
+            'results': results, 'scaling': scaling}
+
+
+def find_regressions(report, baseline, threshold=THRESHOLD):
+    """Returns the entries of report that are slower or bigger than threshold times the baseline.
+
+        Args:
+            report(dict): A report returned by run.
+
+            baseline(dict): A previous report.
+
+            threshold(float): The maximum allowed ratio.
+
+        Returns:
+            list[str]: A description of every regression.
+    """
+    def key(entry):
+        return entry['kind'], entry['n'], entry['backend'], entry['phase']
+
+    previous = {key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in report['results']:
+        old = previous.get(key(entry))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if old[metric] > 0 and entry[metric] / old[metric] > threshold:
+                regressions.append('{} n={} {} {}: {} {:.4g} -> {:.4g} ({:.2f}x)'.format(
+                    entry['kind'], entry['n'], entry['backend'], entry['phase'], metric,
+                    old[metric], entry[metric], entry[metric] / old[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solver scaling benchmark.')
+    parser.add_argument('--sizes', default=','.join(str(n) for n in SIZES),
+                        help='comma separated sizes of the systems')
+    parser.add_argument('--kinds', default=','.join(KINDS), help='comma separated kinds of systems')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write the JSON report to, stdout by default')
+    parser.add_argument('--baseline', help='previous JSON report to compare with')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='maximum ratio of time or memory against the baseline')
+    args = parser.parse_args(argv)
+
+    report = run([int(n) for n in args.sizes.split(',')], args.kinds.split(','), args.repeats, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print('regression: ' + regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import json
+import subprocess
+import sys
+
+""""Import time budget check.
+
+Imports lin_sys in fresh interpreters and fails if the best time is over the
+budget or if importing it loaded any optional backend. Run it from the
+repository directory:
+
+    python check_import_time.py [budget_in_seconds]
+
+"""
+
+
+BUDGET_SECONDS = 0.25
+REPEATS = 5
+FORBIDDEN_MODULES = ('numpy', 'numba', 'nltk', 'scipy')
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import lin_sys
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+
+def measure(repeats=REPEATS):
+    """Returns the best import time of lin_sys and the modules it loaded.
+
+        Args:
+            repeats(int): Number of fresh interpreters to measure.
+
+        Returns:
+            tuple: (seconds, modules) of the fastest run.
+    """
+    best = None
+    for _ in range(repeats):
+        output = subprocess.check_output([sys.executable, '-c', _PROBE])
+        result = json.loads(output.decode().strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best['seconds'], best['modules']
+
+
+def main(budget=BUDGET_SECONDS):
+    seconds, modules = measure()
+    loaded = [m for m in modules if m.split('.')[0] in FORBIDDEN_MODULES]
+    print('import lin_sys: {:.4f}s (budget {:.4f}s)'.format(seconds, budget))
+    if loaded:
+        print('optional backends loaded at import: {}'.format(', '.join(loaded)))
+    return 0 if seconds <= budget and not loaded else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_SECONDS))
@@ -0,0 +1,142 @@
+from copy import deepcopy
+
+""""EliminationPlan class documentation.
+
+This class is a recording of the row operations that lin_sys.LinearSystem
+performed to bring a system to Reduced Row-Echelon Form. Systems that share
+the same zero pattern and pivot sequence can replay the plan and skip the
+pivot search and branching of compute_triangular_form and compute_rref.
+
+Examples:
+    Record the plan once and replay it on systems with the same structure:
+
+    plan = EliminationPlan.record(lin_sys.LinearSystem([p1,p2,p3]))
+
+    rref = lin_sys.LinearSystem([q1,q2,q3]).compute_rref_with_plan(plan)
+
+
+Attributes:
+    num_equations(int): The number of equations of the recorded system.
+
+    dimension(int): The number of variables of the recorded system.
+
+    steps(list[tuple]): The recorded operations in the order they were applied.
+        Each step is a tuple whose first element is one of SWAP, SKIP,
+        CLEAR_BELOW, COEF_TO_ONE or CLEAR_ABOVE followed by the arguments of
+        the operation. SKIP records a column that had no pivot.
+
+"""
+
+
+class EliminationPlan(object):
+
+    SWAP = 'swap'
+    SKIP = 'skip'
+    CLEAR_BELOW = 'clear_below'
+    COEF_TO_ONE = 'coef_to_one'
+    CLEAR_ABOVE = 'clear_above'
+
+    INCOMPATIBLE_SYSTEM_MSG = 'The system does not have the structure of the recorded plan'
+    PIVOT_IS_ZERO_MSG = 'A pivot of the recorded plan is zero in this system'
+    SKIPPED_COLUMN_IS_NONZERO_MSG = 'A column skipped by the recorded plan is not zero in this system'
+
+    def __init__(self, num_equations, dimension):
+        """Initialize an empty plan.
+
+            Args:
+                num_equations(int): The number of equations of the system.
+
+                dimension(int): The number of variables of the system.
+        """
+        self.num_equations = num_equations
+        self.dimension = dimension
+        self.steps = []
+
+    @classmethod
+    def record(cls, system):
+        """Records the plan used to compute the Reduced Row-Echelon Form of system.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to record. It is not
+                                              modified.
+
+            Returns:
+                EliminationPlan: The recorded plan.
+        """
+        plan = cls(len(system), system.dimension)
+        system.compute_rref(plan)
+        return plan
+
+    def add_step(self, operation, *args):
+        """Appends an operation to this plan.
+
+            Args:
+                operation(str): One of SWAP, SKIP, CLEAR_BELOW, COEF_TO_ONE or
+                                CLEAR_ABOVE.
+
+                args(int): The row and column arguments of the operation.
+        """
+        self.steps.append((operation,) + args)
+
+    def is_compatible_with(self, system):
+        """Check if the plan can be replayed on system.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to check.
+
+            Returns:
+                bool: True if system has the same number of equations and
+                      variables as the recorded system.
+        """
+        return len(system) == self.num_equations and system.dimension == self.dimension
+
+    def replay(self, system):
+        """Returns a copy of system in Reduced Row-Echelon Form using this plan.
+
+            No pivot is searched for, only the pivots that the plan uses are
+            checked to be nonzero and the columns it skipped to be zero.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to reduce. It is not
+                                              modified.
+
+            Returns:
+                lin_sys.LinearSystem: A copy of system in Reduced Row-Echelon Form.
+
+            Raises:
+                Exception: If the system is not compatible with the plan or one
+                           of the pivots of the plan is zero in this system
+                           or a skipped column is not.
+        """
+        if not self.is_compatible_with(system):
+            raise Exception(self.INCOMPATIBLE_SYSTEM_MSG)
+
+        rref = deepcopy(system)
+        for step in self.steps:
+            operation = step[0]
+            if operation == self.SWAP:
+                rref.swap_rows(step[1], step[2])
+            elif operation == self.SKIP:
+                row, col = step[1], step[2]
+                # Elimination can leave a nonzero lower in the column even
+                # when the pivot cell is zero, so every row below is checked.
+                if rref.find_idx_with_nonzero(col, row) is not False:
+                    raise Exception(self.SKIPPED_COLUMN_IS_NONZERO_MSG)
+            elif operation == self.CLEAR_BELOW:
+                row, col = step[1], step[2]
+                self._check_pivot(rref, row, col)
+                rref.clear_var(row, col)
+            elif operation == self.COEF_TO_ONE:
+                row, col = step[1], step[2]
+                self._check_pivot(rref, row, col)
+                rref.coef_to_one(row, col)
+            elif operation == self.CLEAR_ABOVE:
+                col, row = step[1], step[2]
+                rref.remove_var_above(col, row)
+
+        return rref
+
+    @staticmethod
+    def _check_pivot(system, row, col):
+        if not system.planes[row].has_nonzero(col):
+            raise Exception(EliminationPlan.PIVOT_IS_ZERO_MSG)
@@ -0,0 +1,434 @@
+import num_types
+from decimal import Decimal
+from vector import Vector
+from math_util import get_policy, in_decimal_context
+
+
+""""Hyperplane class documentation.
+
+This class is a representation of a hyperplane of any dimension: the set of
+points x that satisfy the equation n . x = K. The hyperplane is represented by
+its normal vector n and the constant term K, and with them the basepoint is
+calculated. line.Line and plane.Plane are its 2D and 3D specialisations.
+
+
+Examples:
+    The equation of a hyperplane in 4 dimensions is Ax + By + Cz + Dw = K. K is
+    the constant term and the normal vector has the coordinates (A,B,C,D).
+
+    To instantiate::
+        hyperplane = Hyperplane(Vector(['1.6','2','3','1']),5)
+
+        # The zero hyperplane needs its dimension.
+        hyperplane = Hyperplane(dimension=4)
+
+
+Attributes:
+    normal_vector (Vector): The normal vector of the hyperplane.
+
+    constant_term(Decimal): The constant term of the hyperplane's equation.
+
+    dimension(int): The number of variables of the hyperplane's equation.
+
+    basepoint(Vector): The basepoint of the hyperplane. It is calculated based
+    on the normal_vector and the constant_term the first time it is accessed
+    and kept until one of them changes.
+
+The hyperplane also keeps a bitmask of the coefficients that are exactly
+nonzero (its support). Arithmetic derives the support of the result from the
+supports of the operands and only the coefficients in it are checked, so
+nonzero_pattern, pivot_index and var_count cost O(nonzeros) and are computed
+once per hyperplane.
+
+"""
+
+
+
+class Hyperplane(object):
+
+    NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
+    DIMENSION_REQUIRED_MSG = 'The dimension is required when no normal vector is given'
+
+    # Subclasses with a fixed number of variables set it here.
+    DIMENSION = None
+
+    __slots__ = ('dimension', '_normal_vector', '_constant_term', '_basepoint',
+                 '_basepoint_is_set', '_support', '_pattern', '_pattern_policy')
+
+    def __init__(self, normal_vector=None, constant_term=None, dimension=None):
+        """Hyperplane class constructor.
+
+            Args:
+                normal_vector(vector.Vector): The normal vector of the hyperplane.
+
+                constant_term(Decimal): The constant term of the hyperplane's
+                                        equation.
+
+                dimension(int): The number of variables. Defaults to the
+                                DIMENSION of the class or the dimension of
+                                normal_vector.
+
+            Raises:
+                Exception: If neither the dimension nor the normal vector can
+                           be determined.
+        """
+        if dimension is None:
+            dimension = self.DIMENSION
+        if dimension is None:
+            if not normal_vector:
+                raise Exception(self.DIMENSION_REQUIRED_MSG)
+            dimension = normal_vector.dimension
+        self.dimension = dimension
+
+        if not normal_vector:
+            all_zeros = ['0']*self.dimension
+            normal_vector = Vector(all_zeros)
+        self.normal_vector = normal_vector
+
+        if not constant_term:
+            constant_term = Decimal('0')
+        self.constant_term = Decimal(constant_term)
+
+    @in_decimal_context
+    def is_parallel_to(self,h2):
+        """Check if self and h2 are parallel.
+
+            Args:
+                h2(hyperplane.Hyperplane): The hyperplane to check against.
+
+            Returns:
+                bool: True if self and h2 are parallel, false otherwise.
+
+            Raises:
+                ValueError: If self and h2 normal vectors doesn't have the same
+                dimensions.
+        """
+        return self.normal_vector.is_parallel_to(h2.normal_vector)
+
+    @in_decimal_context
+    def is_same_as(self,h2):
+        """Check if self and h2 are the same hyperplane.
+
+            Args:
+                h2(hyperplane.Hyperplane): The hyperplane to check against.
+
+            Returns:
+                bool: True if self and h2 are the same hyperplane, false otherwise.
+
+            Raises:
+                ValueError: If self and h2 normal vectors doesn't have the same
+                dimensions.
+        """
+        if(self.normal_vector.is_zero() and h2.normal_vector.is_zero()):
+            diff = self.constant_term - h2.constant_term
+            return get_policy().is_near_zero(diff)
+
+        atLeastOneZero =  self.normal_vector.is_zero() or h2.normal_vector.is_zero()
+
+        if(atLeastOneZero):
+            return False
+
+        areParallel = self.is_parallel_to(h2)
+        if(not areParallel):
+            return False
+        vectorBetweenBasepoints = self.basepoint - h2.basepoint
+        return vectorBetweenBasepoints.is_orthogonal_to(self.normal_vector) and vectorBetweenBasepoints.is_orthogonal_to(h2.normal_vector)
+
+    @in_decimal_context
+    def canonical_form(self):
+        """Returns the unit normal vector and offset of this hyperplane with a fixed orientation.
+
+            The equation is divided by the module of the normal vector and its
+            sign is chosen so that the first coordinate bigger than
+            1/(2*sqrt(dimension)) in absolute value is positive. Hyperplanes
+            that are the same have the same canonical form, or its opposite,
+            and parallel ones the same unit normal or its opposite: no sign
+            rule can be stable for every normal, so when a coordinate is
+            close to that threshold small errors can flip the orientation.
+            canonical_key and hyperplane_grouping compare both orientations.
+
+            Returns:
+                tuple: (normal, offset) where normal is a tuple of Decimals.
+                       The normal is all zeros if the normal vector is zero.
+        """
+        coordinates = tuple(self.normal_vector)
+        module = sum(c * c for c in coordinates).sqrt()
+        if module == 0:
+            return coordinates, self.constant_term
+
+        threshold = module / (2 * Decimal(self.dimension).sqrt())
+        leading = next(c for c in coordinates if abs(c) > threshold)
+        scale = (1 if leading > 0 else -1) / module
+        return tuple(c * scale for c in coordinates), self.constant_term * scale
+
+    def canonical_key(self, quantum='1e-9'):
+        """Returns a hashable key that is equal for hyperplanes that are the same.
+
+            Args:
+                quantum(Decimal): The resolution of the key. Coordinates of the
+                                  canonical form are rounded to multiples of it.
+
+            Returns:
+                tuple: (direction, offset) where direction is a tuple of ints
+                       equal for parallel hyperplanes and offset is an int.
+                       Of the quantised canonical form and its opposite the
+                       lexicographically bigger one is returned, so the key
+                       doesn't depend on the orientation of the form. A zero
+                       normal keeps the sign of its offset: like in
+                       is_same_as, 0 = 5 and 0 = -5 are different.
+        """
+        quantum = Decimal(quantum)
+        normal, offset = self.canonical_form()
+        direction = tuple(int((c / quantum).to_integral_value()) for c in normal)
+        offset = int((offset / quantum).to_integral_value())
+        if not any(normal):
+            return direction, offset
+        opposite = tuple(-c for c in direction)
+        if opposite > direction:
+            return opposite, -offset
+        return direction, offset
+
+    def var_count(self):
+        """Returns a count of the number of variables present in the equation.
+
+        Returns:
+            int: Count of variables in this hyperplane's equation.
+
+        """
+        return bin(self.nonzero_pattern()).count('1')
+
+    @in_decimal_context
+    def __add__(self,operand):
+        """Add a number or a hyperplane to this equation. The result is a new hyperplane.
+
+            Args:
+                operand(hyperplane.Hyperplane): Another hyperplane to be added to
+                                                this one.
+                operand(int): An int to add to this hyperplane's equation.
+                operand(float): A float to add to this hyperplane's equation.
+                operand(Decimal): A Decimal to add to this hyperplane's equation.
+
+            Returns:
+                hyperplane.Hyperplane: A hyperplane of the same class equals to
+                                       this one plus the operand.
+
+            Raises:
+                TypeError:  Thrown if the operand param is not a valid type.
+
+
+        """
+        if(isinstance(operand, Hyperplane)):
+            normal_vector = self.normal_vector + operand.normal_vector
+            constant_term = self.constant_term + operand.constant_term
+            candidates = self.support() | operand.support()
+            support = Hyperplane._support_of(normal_vector.coordinates, candidates)
+
+        elif(isinstance(operand,num_types.numeric_types)):
+            normal_vector = self.normal_vector + operand
+            constant_term = self.constant_term + operand
+            support = None
+        else:
+            raise TypeError("You can only add numbers and hyperplanes.")
+
+        response = type(self)(normal_vector, constant_term, self.dimension)
+        response._support = support
+        return response
+
+    @in_decimal_context
+    def __mul__(self, coefficient):
+        """Multiply every term of this equation by a number. The result is a new hyperplane.
+
+            Args:
+                coefficient(Decimal): The number to multiply by.
+
+            Returns:
+                hyperplane.Hyperplane: A hyperplane of the same class.
+        """
+        response = type(self)(self.normal_vector * coefficient, self.constant_term * coefficient,
+                              self.dimension)
+        response._support = self.support() if coefficient else 0
+        return response
+
+    def support(self):
+        """Returns the bitmask of the coefficients that are exactly nonzero.
+
+            Returns:
+                int: Bit i is set if the ith coefficient is not zero.
+        """
+        if self._support is None:
+            self._support = Hyperplane._support_of(self.normal_vector.coordinates,
+                                                    (1 << self.dimension) - 1)
+        return self._support
+
+    def nonzero_pattern(self):
+        """Returns the bitmask of the coefficients that are not near zero.
+
+            Only the coefficients in the support are checked and the result is
+            kept until the normal vector or the math_util policy change.
+
+            Returns:
+                int: Bit i is set if the ith coefficient is not near zero.
+        """
+        policy = get_policy()
+        if self._pattern is None or self._pattern_policy is not policy:
+            coordinates = self.normal_vector.coordinates
+            pattern = 0
+            remaining = self.support()
+            while remaining:
+                bit = remaining & -remaining
+                if not policy.is_near_zero(coordinates[bit.bit_length() - 1]):
+                    pattern |= bit
+                remaining ^= bit
+            self._pattern = pattern
+            self._pattern_policy = policy
+        return self._pattern
+
+    def pivot_index(self):
+        """Returns the index of the first coefficient that is not near zero.
+
+            Returns:
+                int: The index, or -1 if all the coefficients are near zero.
+        """
+        pattern = self.nonzero_pattern()
+        return (pattern & -pattern).bit_length() - 1
+
+    def has_nonzero(self, idx):
+        """Returns True if the coefficient in index idx is not near zero."""
+        return (self.nonzero_pattern() >> idx) & 1 == 1
+
+    @staticmethod
+    def _support_of(coordinates, candidates):
+        support = 0
+        while candidates:
+            bit = candidates & -candidates
+            if coordinates[bit.bit_length() - 1]:
+                support |= bit
+            candidates ^= bit
+        return support
+
+    @property
+    def normal_vector(self):
+        """vector.Vector: The normal vector. Setting it discards the basepoint."""
+        return self._normal_vector
+
+    @normal_vector.setter
+    def normal_vector(self, normal_vector):
+        self._normal_vector = normal_vector
+        self._basepoint_is_set = False
+        self._support = None
+        self._pattern = None
+
+    @property
+    def constant_term(self):
+        """Decimal: The constant term. Setting it discards the basepoint."""
+        return self._constant_term
+
+    @constant_term.setter
+    def constant_term(self, constant_term):
+        self._constant_term = constant_term
+        self._basepoint_is_set = False
+
+    @property
+    def basepoint(self):
+        """vector.Vector: The basepoint, calculated on first access. None if
+        the normal vector is zero."""
+        if not self._basepoint_is_set:
+            self.set_basepoint()
+        return self._basepoint
+
+    @basepoint.setter
+    def basepoint(self, basepoint):
+        self._basepoint = basepoint
+        self._basepoint_is_set = True
+
+    @in_decimal_context
+    def set_basepoint(self):
+        """Calculates and set a basepoint based on the normal_vector and the constant_term.
+
+        """
+        try:
+            n = self.normal_vector
+            c = self.constant_term
+            basepoint_coords = ['0']*self.dimension
+
+            initial_index = self.pivot_index()
+            if initial_index < 0:
+                raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
+            initial_coefficient = n[initial_index]
+
+            basepoint_coords[initial_index] = c/initial_coefficient
+            self.basepoint = Vector(basepoint_coords)
+
+        except Exception as e:
+            if str(e) == Hyperplane.NO_NONZERO_ELTS_FOUND_MSG:
+                self.basepoint = None
+            else:
+                raise e
+
+    def __str__(self):
+        """Represent this hyperplane as an equation.
+        """
+        num_decimal_places = 3
+
+        def write_coefficient(coefficient, is_initial_term=False):
+            coefficient = round(coefficient, num_decimal_places)
+            if coefficient % 1 == 0:
+                coefficient = int(coefficient)
+
+            output = ''
+
+            if coefficient < 0:
+                output += '-'
+            if coefficient > 0 and not is_initial_term:
+                output += '+'
+
+            if not is_initial_term:
+                output += ' '
+
+            if abs(coefficient) != 1:
+                output += '{}'.format(abs(coefficient))
+
+            return output
+
+        n = self.normal_vector
+
+        try:
+            initial_index = self.pivot_index()
+            if initial_index < 0:
+                raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
+            terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
+                     for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
+            output = ' '.join(terms)
+
+        except Exception as e:
+            if str(e) == self.NO_NONZERO_ELTS_FOUND_MSG:
+                output = '0'
+            else:
+                raise e
+
+        constant = round(self.constant_term, num_decimal_places)
+        if constant % 1 == 0:
+            constant = int(constant)
+        output += ' = {}'.format(constant)
+
+        return output
+
+    @staticmethod
+    def first_nonzero_index(iterable):
+
+        """Returns the index of the first non-zero value in iterable.
+
+            Args:
+                iterable(iterable): The iterable to search in.
+
+            Returns:
+                int: The index of the first non-zero value of iterable.
+
+            Raises:
+                Exception: If all items are zero.
+        """
+        policy = get_policy()
+        for k, item in enumerate(iterable):
+            if not policy.is_near_zero(item):
+                return k
+        raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
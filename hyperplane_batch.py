@@ -0,0 +1,154 @@
+import numpy as np
+
+""""Batch point classification documentation.
+
+Vectorized queries of many points against many hyperplanes (line.Line,
+plane.Plane or hyperplane.Hyperplane of any dimension). The hyperplanes are
+turned into a matrix of normal vectors and a vector of constant terms once,
+and the M x N signed distances come from a single matrix product instead of
+a Vector.dot per point and hyperplane.
+
+The signed distance of a point x to the hyperplane n . x = K is
+(n . x - K) / |n|: positive on the side the normal vector points to, negative
+on the other one and zero on the hyperplane.
+
+Examples:
+    distances = signed_distances(points, planes)          # shape (M, N)
+
+    sides = classify_points(points, planes)               # +1, -1 or 0
+
+    inside = points_in_convex_region(points, planes)      # n . x <= K for all planes
+
+"""
+
+
+ABOVE = 1
+ON = 0
+BELOW = -1
+
+
+def hyperplanes_to_arrays(hyperplanes):
+    """Returns the normal vectors and constant terms of hyperplanes as arrays.
+
+        Args:
+            hyperplanes(list[hyperplane.Hyperplane]): Hyperplanes of the same
+                                                      dimension.
+
+        Returns:
+            tuple: (normals, constants) of shapes (N, dimension) and (N,).
+    """
+    normals = np.array([[float(c) for c in h.normal_vector] for h in hyperplanes], dtype=float)
+    constants = np.array([float(h.constant_term) for h in hyperplanes], dtype=float)
+    return normals, constants
+
+
+def _as_arrays(hyperplanes):
+    if isinstance(hyperplanes, tuple):
+        normals, constants = hyperplanes
+        return np.asarray(normals, dtype=float), np.asarray(constants, dtype=float)
+    return hyperplanes_to_arrays(hyperplanes)
+
+
+def _as_points(points):
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=float)
+    return np.array([[float(c) for c in p] for p in points], dtype=float)
+
+
+def _unit(normals, constants):
+    norms = np.linalg.norm(normals, axis=1)
+    norms[norms == 0] = 1.0
+    return normals / norms[:, None], constants / norms
+
+
+def signed_distances(points, hyperplanes):
+    """Returns the signed distance of every point to every hyperplane.
+
+        Args:
+            points(list[vector.Vector]): The points, or an array of shape
+                                         (M, dimension).
+
+            hyperplanes(list[hyperplane.Hyperplane]): The hyperplanes, or the
+                (normals, constants) tuple returned by hyperplanes_to_arrays.
+
+        Returns:
+            numpy.ndarray: Shape (M, N).
+    """
+    normals, constants = _unit(*_as_arrays(hyperplanes))
+    return _as_points(points) @ normals.T - constants
+
+
+def classify_points(points, hyperplanes, tolerance=1e-10):
+    """Returns the side of every hyperplane every point is on.
+
+        Args:
+            points(list[vector.Vector]): The points, or an array of shape
+                                         (M, dimension).
+
+            hyperplanes(list[hyperplane.Hyperplane]): The hyperplanes, or the
+                (normals, constants) tuple returned by hyperplanes_to_arrays.
+
+            tolerance(float): Points closer than this to a hyperplane are on it.
+
+        Returns:
+            numpy.ndarray: Shape (M, N) of int8. ABOVE, BELOW or ON.
+    """
+    distances = signed_distances(points, hyperplanes)
+    sides = np.sign(distances).astype(np.int8)
+    sides[np.abs(distances) <= tolerance] = ON
+    return sides
+
+
+def project_points(points, hyperplanes):
+    """Returns the orthogonal projection of every point onto every hyperplane.
+
+        Args:
+            points(list[vector.Vector]): The points, or an array of shape
+                                         (M, dimension).
+
+            hyperplanes(list[hyperplane.Hyperplane]): The hyperplanes, or the
+                (normals, constants) tuple returned by hyperplanes_to_arrays.
+
+        Returns:
+            numpy.ndarray: Shape (M, N, dimension).
+    """
+    normals, constants = _unit(*_as_arrays(hyperplanes))
+    points = _as_points(points)
+    distances = points @ normals.T - constants
+    return points[:, None, :] - distances[:, :, None] * normals[None, :, :]
+
+
+def points_in_convex_region(points, hyperplanes, tolerance=1e-10, chunk_size=64):
+    """Returns which points satisfy n . x <= K for every hyperplane.
+
+        The hyperplanes are checked chunk_size at a time and only the points
+        that are still inside are checked against the next chunk, so points
+        that fall outside early stop costing anything.
+
+        Args:
+            points(list[vector.Vector]): The points, or an array of shape
+                                         (M, dimension).
+
+            hyperplanes(list[hyperplane.Hyperplane]): The half-spaces, or the
+                (normals, constants) tuple returned by hyperplanes_to_arrays.
+
+            tolerance(float): Points closer than this to a hyperplane satisfy it.
+
+            chunk_size(int): The number of hyperplanes checked per pass.
+
+        Returns:
+            numpy.ndarray: Shape (M,) of bools.
+    """
+    normals, constants = _unit(*_as_arrays(hyperplanes))
+    points = _as_points(points)
+    inside = np.ones(len(points), dtype=bool)
+    candidates = np.arange(len(points))
+    for start in range(0, len(normals), chunk_size):
+        if len(candidates) == 0:
+            break
+        chunk = slice(start, start + chunk_size)
+        distances = points[candidates] @ normals[chunk].T - constants[chunk]
+        outside = (distances > tolerance).any(axis=1)
+        inside[candidates[outside]] = False
+        candidates = candidates[~outside]
+    return inside
@@ -0,0 +1,115 @@
+import itertools
+import math
+
+""""Hyperplane grouping documentation.
+
+Groups collections of lines, planes or hyperplanes with hashing instead of
+comparing every pair with Hyperplane.is_parallel_to and is_same_as. Each
+hyperplane is reduced once to its canonical form (unit normal vector and
+offset, see Hyperplane.canonical_form) and grouped by the quantised key of
+that form, so grouping n hyperplanes costs O(n). The orientation of a
+canonical form can flip for normals close to its sign threshold, so keys and
+comparisons treat a form and its opposite as the same, except for a zero
+normal, where the sign of the offset matters like in Hyperplane.is_same_as.
+
+Quantising puts values that are closer than the quantum in different buckets
+when they sit on both sides of a bucket boundary. group_parallel and
+group_coincident accept that; find_near_duplicates also looks in the
+neighbouring buckets and compares the candidates, so it finds every pair
+within the tolerance.
+
+Examples:
+    families = group_parallel(planes)       # [[0, 3], [1], [2, 4, 5]]
+
+    same = group_coincident(planes)         # [[0], [3], [1], [2, 5], [4]]
+
+    pairs = find_near_duplicates(planes, tolerance=1e-6)   # [(2, 5)]
+
+"""
+
+
+def _group_by(keys):
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    return list(groups.values())
+
+
+def group_parallel(hyperplanes, quantum='1e-9'):
+    """Groups hyperplanes into families of parallel hyperplanes.
+
+        Args:
+            hyperplanes(list[hyperplane.Hyperplane]): The hyperplanes to group.
+
+            quantum(Decimal): The resolution of the canonical keys.
+
+        Returns:
+            list[list[int]]: The indices of the hyperplanes of every family, in
+                             order of first appearance.
+    """
+    return _group_by(h.canonical_key(quantum)[0] for h in hyperplanes)
+
+
+def group_coincident(hyperplanes, quantum='1e-9'):
+    """Groups hyperplanes into sets of hyperplanes that are the same.
+
+        Args:
+            hyperplanes(list[hyperplane.Hyperplane]): The hyperplanes to group.
+
+            quantum(Decimal): The resolution of the canonical keys.
+
+        Returns:
+            list[list[int]]: The indices of the hyperplanes of every set, in
+                             order of first appearance.
+    """
+    return _group_by(h.canonical_key(quantum) for h in hyperplanes)
+
+
+def find_near_duplicates(hyperplanes, tolerance=1e-6):
+    """Returns the pairs of hyperplanes whose canonical forms are within tolerance.
+
+        Every hyperplane is put in the bucket of its canonical form quantised to
+        tolerance and is compared only with the hyperplanes of its bucket and
+        the neighbouring ones. It is meant for low dimensions: there are
+        3**(dimension + 1) neighbouring buckets.
+
+        Args:
+            hyperplanes(list[hyperplane.Hyperplane]): The hyperplanes to check.
+
+            tolerance(float): The maximum difference of every coordinate of the
+                              unit normal and of the offset, with either
+                              orientation of the canonical forms. Equations
+                              with a zero normal are only compared with the
+                              orientation they have.
+
+        Returns:
+            list[tuple[int, int]]: The pairs (i, j), i < j, of near duplicates.
+    """
+    forms = []
+    buckets = {}
+    for i, h in enumerate(hyperplanes):
+        normal, offset = h.canonical_form()
+        form = tuple(float(c) for c in normal) + (float(offset),)
+        forms.append(form)
+        buckets.setdefault(_bucket(form, tolerance), []).append(i)
+
+    pairs = set()
+    offsets = list(itertools.product((-1, 0, 1), repeat=len(forms[0]))) if forms else []
+    for i, form in enumerate(forms):
+        # The other hyperplane may have the opposite orientation, unless the
+        # normal is zero: then the sign of the offset matters, like in is_same_as.
+        candidates = [form]
+        if any(form[:-1]):
+            candidates.append(tuple(-value for value in form))
+        for candidate in candidates:
+            bucket = _bucket(candidate, tolerance)
+            for offset in offsets:
+                neighbour = tuple(b + o for b, o in zip(bucket, offset))
+                for j in buckets.get(neighbour, ()):
+                    if i < j and all(abs(a - b) <= tolerance for a, b in zip(candidate, forms[j])):
+                        pairs.add((i, j))
+    return sorted(pairs)
+
+
+def _bucket(form, tolerance):
+    return tuple(int(math.floor(value / tolerance)) for value in form)
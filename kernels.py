@@ -0,0 +1,343 @@
+import math
+
+import backends
+
+""""Numeric kernels documentation.
+
+Float versions of the inner loops of lin_sys.LinearSystem (clear_var,
+remove_var_above, coef_to_one and the elimination that uses them), used by
+LinearSystem.solve_float and process_batch, and of the reductions of
+vector.Vector (dot, module), for single arrays and for whole batches of rows
+at once with dot_rows and norm_rows. The same Python source is used twice: as
+plain Python working on lists, and compiled to machine code with numba's njit
+working on numpy arrays, when the numba backend is available. Both sets are
+registered in the backends registry as 'python_kernels' and 'numba_kernels'.
+
+The Decimal methods of LinearSystem and vector.Vector don't use them: they
+work on one row or vector at a time, and converting it to floats and back on
+every call would cost more than the loop it replaces. Code that has many
+vectors converts them once and calls dot_rows or norm_rows.
+
+get_kernels returns the compiled set if it can be loaded and the Python one
+otherwise, so callers never depend on numba being installed.
+
+Examples:
+    k = get_kernels()
+    a = k.as_matrix([[1, 1, 2], [1, -1, 0]])     # augmented rows
+    pivots = k.as_pivots(2)
+    rank = k.rref(a, pivots, 1e-10)
+
+    norm_rows([Vector(['3', '4']), Vector(['1', '0'])])     # [5.0, 1.0]
+
+"""
+
+
+class KernelSet(object):
+    """A set of kernels and the containers they work on.
+
+        Attributes:
+            name(str): 'numba' or 'python'.
+
+            clear_below(callable): clear_below(a, row, col) eliminates the
+                variable col from the rows below row.
+
+            clear_above(callable): clear_above(a, row, col) eliminates the
+                variable col from the rows above row.
+
+            scale_to_one(callable): scale_to_one(a, row, col) divides row by
+                its coefficient in col.
+
+            rref(callable): rref(a, pivots, eps) brings the augmented matrix a
+                to Reduced Row-Echelon Form in place, writes the pivot column
+                of each row in pivots (-1 for rows without one) and returns the
+                rank. Coefficients with absolute value smaller than eps are zero.
+
+            dot(callable): dot(u, v) returns the dot product.
+
+            norm(callable): norm(u) returns the module.
+
+            dot_rows(callable): dot_rows(a, b, out) writes the dot product of
+                row i of a and row i of b in out[i].
+
+            norm_rows(callable): norm_rows(a, out) writes the module of row i
+                of a in out[i].
+
+            as_matrix(callable): Converts a list of rows, or a matrix.Matrix,
+                to what the kernels expect.
+
+            as_vector(callable): Converts a list of numbers to what the kernels
+                expect.
+
+            as_pivots(callable): as_pivots(m) returns an int container of size m.
+
+            as_values(callable): as_values(m) returns a float container of
+                size m.
+    """
+
+    def __init__(self, name, kernels, as_matrix, as_vector, as_pivots, as_values):
+        self.name = name
+        (self.clear_below, self.clear_above, self.scale_to_one, self.rref,
+         self.dot, self.norm, self.dot_rows, self.norm_rows) = kernels
+        self.as_matrix = as_matrix
+        self.as_vector = as_vector
+        self.as_pivots = as_pivots
+        self.as_values = as_values
+
+
+def make_kernels(jit):
+    """Returns the kernel functions compiled with jit.
+
+        Args:
+            jit(callable): A decorator applied to every kernel, like numba.njit.
+                           The identity gives the Python kernels.
+
+        Returns:
+            tuple: (clear_below, clear_above, scale_to_one, rref, dot, norm,
+                   dot_rows, norm_rows).
+    """
+
+    @jit
+    def clear_below(a, row, col):
+        pivot_row = a[row]
+        pivot = pivot_row[col]
+        width = len(pivot_row)
+        for i in range(row + 1, len(a)):
+            target = a[i]
+            factor = target[col] / pivot
+            if factor != 0.0:
+                for k in range(col, width):
+                    target[k] -= factor * pivot_row[k]
+
+    @jit
+    def clear_above(a, row, col):
+        pivot_row = a[row]
+        pivot = pivot_row[col]
+        width = len(pivot_row)
+        for i in range(row - 1, -1, -1):
+            target = a[i]
+            factor = target[col] / pivot
+            if factor != 0.0:
+                for k in range(col, width):
+                    target[k] -= factor * pivot_row[k]
+
+    @jit
+    def scale_to_one(a, row, col):
+        target = a[row]
+        inverse = 1.0 / target[col]
+        for k in range(len(target)):
+            target[k] *= inverse
+
+    @jit
+    def rref(a, pivots, eps):
+        m = len(a)
+        n = len(a[0]) - 1 if m > 0 else 0
+        rank = 0
+        for i in range(m):
+            pivots[i] = -1
+
+        col = 0
+        while rank < m and col < n:
+            found = -1
+            for i in range(rank, m):
+                if abs(a[i][col]) >= eps:
+                    found = i
+                    break
+            if found < 0:
+                col += 1
+                continue
+            if found != rank:
+                for k in range(n + 1):
+                    swap = a[rank][k]
+                    a[rank][k] = a[found][k]
+                    a[found][k] = swap
+            clear_below(a, rank, col)
+            pivots[rank] = col
+            rank += 1
+            col += 1
+
+        for i in range(rank - 1, -1, -1):
+            scale_to_one(a, i, pivots[i])
+            clear_above(a, i, pivots[i])
+        return rank
+
+    @jit
+    def dot(u, v):
+        result = 0.0
+        for i in range(len(u)):
+            result += u[i] * v[i]
+        return result
+
+    @jit
+    def norm(u):
+        return math.sqrt(dot(u, u))
+
+    @jit
+    def dot_rows(a, b, out):
+        for i in range(len(a)):
+            out[i] = dot(a[i], b[i])
+
+    @jit
+    def norm_rows(a, out):
+        for i in range(len(a)):
+            out[i] = math.sqrt(dot(a[i], a[i]))
+
+    return clear_below, clear_above, scale_to_one, rref, dot, norm, dot_rows, norm_rows
+
+
+def interpret_rref(a, pivots, dimension, eps):
+    """Returns the solution of a system from its Reduced Row-Echelon Form.
+
+        Follows the rules of lin_sys.LinearSystem.solve.
+
+        Args:
+            a: The augmented matrix after rref.
+
+            pivots: The pivots written by rref.
+
+            dimension(int): Number of variables.
+
+            eps(float): Coefficients with absolute value smaller than this are zero.
+
+        Returns:
+            list[float]: If there is an unique solution.
+
+            bool: False if there is no solution and True if there are many
+                solutions.
+    """
+    unique_solution = [0.0] * dimension
+    one_variable_alone = False
+    single_solution = True
+
+    for i in range(len(a)):
+        row = a[i]
+        pivot_var_idx = int(pivots[i])
+        if pivot_var_idx < 0 and abs(row[dimension]) >= eps:
+            return False
+
+        number_of_vars = sum(1 for k in range(dimension) if abs(row[k]) >= eps)
+        if number_of_vars == 1:
+            one_variable_alone = True
+            unique_solution[pivot_var_idx] = float(row[dimension] / row[pivot_var_idx])
+        elif number_of_vars > 1:
+            single_solution = False
+
+    if one_variable_alone and not single_solution:
+        return False
+    elif not one_variable_alone and not single_solution:
+        return True
+    return unique_solution
+
+
+DIFFERENT_NUMBER_OF_VECTORS_MSG = 'Both batches must have the same number of vectors'
+
+
+def _to_list(values):
+    return values.tolist() if hasattr(values, 'tolist') else values
+
+
+def _identity(function):
+    return function
+
+
+def _float_rows(rows):
+    # A matrix.Matrix already holds floats, so its rows are read as they are.
+    if hasattr(rows, 'tolist'):
+        return rows.tolist()
+    return [[float(value) for value in row] for row in rows]
+
+
+def build_python_kernels():
+    """Returns the KernelSet of plain Python kernels working on lists."""
+    return KernelSet('python', make_kernels(_identity),
+                     _float_rows,
+                     lambda values: [float(value) for value in values],
+                     lambda m: [-1] * m,
+                     lambda m: [0.0] * m)
+
+
+def build_numba_kernels():
+    """Returns the KernelSet compiled with numba, working on numpy arrays.
+
+        Raises:
+            ImportError: If numba or numpy are not available.
+    """
+    numba = backends.get_backend('numba')
+    np = backends.get_backend('numpy')
+    return KernelSet('numba', make_kernels(numba.njit(cache=False)),
+                     lambda rows: np.array(rows.to_numpy() if hasattr(rows, 'to_numpy') else _float_rows(rows),
+                                           dtype=np.float64),
+                     lambda values: np.array([float(value) for value in values], dtype=np.float64),
+                     lambda m: np.full(m, -1, dtype=np.int64),
+                     lambda m: np.zeros(m, dtype=np.float64))
+
+
+backends.register_backend('python_kernels', build_python_kernels)
+backends.register_backend('numba_kernels', build_numba_kernels)
+
+
+def get_kernels(name=None):
+    """Returns a KernelSet.
+
+        Args:
+            name(str): 'numba' or 'python'. By default the numba kernels are
+                       returned if they can be loaded and the Python ones
+                       otherwise.
+
+        Returns:
+            KernelSet: The kernels.
+
+        Raises:
+            ImportError: If the requested kernels are not available.
+    """
+    if name is not None:
+        return backends.get_backend(name + '_kernels')
+    if backends.is_available('numba_kernels'):
+        return backends.get_backend('numba_kernels')
+    return backends.get_backend('python_kernels')
+
+
+def dot_rows(us, vs, kernels=None):
+    """Returns the dot product of every pair of vectors, in floats.
+
+        Args:
+            us(list): vector.Vector instances or lists of numbers, or a
+                      matrix.Matrix with a vector per row.
+
+            vs(list): As many vectors as us, of the same dimensions.
+
+            kernels(KernelSet): Defaults to get_kernels().
+
+        Returns:
+            list[float]: us[i] . vs[i] for every i.
+
+        Raises:
+            ValueError: If us and vs don't have the same number of vectors.
+    """
+    kernels = kernels or get_kernels()
+    a, b = kernels.as_matrix(us), kernels.as_matrix(vs)
+    if len(a) != len(b):
+        raise ValueError(DIFFERENT_NUMBER_OF_VECTORS_MSG)
+    out = kernels.as_values(len(a))
+    if len(a):
+        kernels.dot_rows(a, b, out)
+    return _to_list(out)
+
+
+def norm_rows(vectors, kernels=None):
+    """Returns the module of every vector, in floats.
+
+        Args:
+            vectors(list): vector.Vector instances or lists of numbers, or a
+                           matrix.Matrix with a vector per row.
+
+            kernels(KernelSet): Defaults to get_kernels().
+
+        Returns:
+            list[float]: The modules, in order.
+    """
+    kernels = kernels or get_kernels()
+    a = kernels.as_matrix(vectors)
+    out = kernels.as_values(len(a))
+    if len(a):
+        kernels.norm_rows(a, out)
+    return _to_list(out)
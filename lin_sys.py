@@ -1,19 +1,21 @@
-from decimal import Decimal, getcontext
+from decimal import Decimal
 from copy import deepcopy
 
 from vector import Vector
-from math_util import MyDecimal
-from plane import Plane
-from nltk.app.nemo_app import initialFind
-from numba.cuda import initialize
+from math_util import get_policy, in_decimal_context
+from elimination_plan import EliminationPlan
+from lu import LUFactorization
+from kernels import get_kernels, interpret_rref
+from pivoting import eliminate, PARTIAL
+from matrix import Matrix
 
-getcontext().prec = 30
 
 """"LinearSysten class documentation.
 
 This class is a representation a system of first grade equations. Equations
-are represented with the class plane.Plane. The equations cannot have more than
-3 independent variables.
+are represented with the class hyperplane.Hyperplane or its specialisations
+line.Line and plane.Plane, so the equations can have any number of
+independent variables as long as all of them have the same.
 
 Examples:
     You create a system of 2 planes like following: 
@@ -26,10 +28,9 @@ Examples:
         
     
 Attributes:
-    planes (list[plane.Plane]): The list of planes in this system.
+    planes (list[hyperplane.Hyperplane]): The list of equations in this system.
         
-    dimension(int): The number of independent variables in the plane equations.
-                    Always equals to 3.
+    dimension(int): The number of independent variables in the equations.
                     
 """
 
@@ -52,11 +53,22 @@ class LinearSystem(object):
 
             self.planes = planes
             self.dimension = d
+            self._factorization = None
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
 
+    def __deepcopy__(self, memo):
+        """Returns a copy with copies of the equations and no cached factorization."""
+        system = type(self).__new__(type(self))
+        memo[id(self)] = system
+        for name, value in self.__dict__.items():
+            if name != '_factorization':
+                setattr(system, name, deepcopy(value, memo))
+        system._factorization = None
+        return system
+
     #Provided by Udacity.
     def swap_rows(self, row1, row2):
         
@@ -80,11 +92,7 @@ class LinearSystem(object):
                 row(int): Index of the row to which the coefficient will be multiplied.         
             
         """
-        normal_vector = self[row].normal_vector
-        k = self[row].constant_term          
-        normal_vector = normal_vector * coefficient;
-        k = k * coefficient      
-        self[row] = Plane(normal_vector,k)        
+        self[row] = self[row] * coefficient
         
 
 
@@ -127,13 +135,7 @@ class LinearSystem(object):
         indices = [-1] * num_equations
 
         for i, p in enumerate(self.planes):
-            try:
-                indices[i] = p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
-                else:
-                    raise e
+            indices[i] = p.pivot_index()
 
         return indices
 
@@ -156,8 +158,8 @@ class LinearSystem(object):
                 i(int): Index of the equation. 
                 
             Returns:
-                plane.Plane: Plane in the ith representing the ith equation of 
-                             the system.
+                hyperplane.Hyperplane: The hyperplane representing the ith
+                                       equation of the system.
             Raises:
                  IndexError: If i is bigger than the number of equations in the
                              system.
@@ -202,23 +204,104 @@ class LinearSystem(object):
         return ret
     
     
+    def coefficient_rows(self):
+        """Returns the coefficients of the equations as a list of rows.
+        
+            Returns:
+                list[list[Decimal]]: The ith row has the coefficients of the
+                                     ith equation.
+        """
+        return [list(p.normal_vector) for p in self.planes]
+    
+    @in_decimal_context
+    def factorize(self, tolerance=None):
+        """Returns the LU factorization of the coefficients of this system.
+        
+            The factorization is kept and returned again while the 
+            coefficients of the system have the same values, so determinant, 
+            inverse and rank share one elimination. Changing an equation, or 
+            its normal vector in place, is noticed.
+            
+            Args:
+                tolerance(Decimal): Pivots not bigger than this are considered
+                                    zero. Defaults to the magnitude_eps of
+                                    math_util.get_policy().
+                                    
+            Returns:
+                lu.LUFactorization: The factorization of the coefficients.
+        """
+        if tolerance is None:
+            tolerance = get_policy().magnitude_eps
+        # Keyed on the values: comparing them is O(n^2), factorizing O(n^3).
+        key = (tolerance, tuple(p.normal_vector.coordinates for p in self.planes))
+        cached = self._factorization
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        factorization = LUFactorization(self.coefficient_rows(), tolerance)
+        self._factorization = (key, factorization)
+        return factorization
+    
+    @in_decimal_context
+    def determinant(self):
+        """Returns the determinant of the coefficients of this system.
+        
+            Returns:
+                Decimal: The determinant. Zero if the system has no unique solution.
+            
+            Raises:
+                Exception: If the number of equations and variables differ.
+        """
+        return self.factorize().determinant()
+    
+    @in_decimal_context
+    def inverse(self):
+        """Returns the inverse of the coefficients of this system.
+        
+            Returns:
+                list[list[Decimal]]: The rows of the inverse.
+            
+            Raises:
+                Exception: If the number of equations and variables differ or 
+                           the coefficients are singular.
+        """
+        return self.factorize().inverse()
+    
+    def rank(self):
+        """Returns the rank of the coefficients of this system.
+        
+            Returns:
+                int: The number of linearly independent equations, ignoring 
+                     the constant terms.
+        """
+        return self.factorize().rank()
+    
     def get_first_col_where_one_coefficient_is_zero_and_other_no(self,row,row2):
-                        
+        """Returns the first variable that is zero in one of two equations but not in the other.
+        
+            Args:
+                row(int): Index of the first equation.
                 
-        for col in range(0,self.dimension):
-            coefficient_row = 0 if MyDecimal(self.planes[row].normal_vector[col]).is_near_zero() else self.planes[row].normal_vector[col]  
-            coefficient_row2 = 0 if MyDecimal(self.planes[row].normal_vector[col]).is_near_zero() else self.planes[row2].normal_vector[col]
-            one_is_zero_but_not_both = coefficient_row * coefficient_row2 == 0 and (coefficient_row + coefficient_row2 != 0) 
-            if(one_is_zero_but_not_both):
-                return col
-            
-        return None
+                row2(int): Index of the second equation.
+                
+            Returns:
+                int: The index of the variable, or None if there is none.
+        """
+        one_is_zero_but_not_both = self.planes[row].nonzero_pattern() ^ self.planes[row2].nonzero_pattern()
+        if not one_is_zero_but_not_both:
+            return None
+        return (one_is_zero_but_not_both & -one_is_zero_but_not_both).bit_length() - 1
             
 
 
     
-    def compute_triangular_form(self):
+    @in_decimal_context
+    def compute_triangular_form(self, plan=None):
         """This function will return a different copy of this system in triangular form.
+        
+            Args:
+                plan(elimination_plan.EliminationPlan): If provided, the row 
+                    operations used are recorded in it.
              
             Returns:
                 LinearSystem: A new system equals to this one in triangular form.
@@ -229,16 +312,21 @@ class LinearSystem(object):
         j= 0
         for i,_ in enumerate(system.planes):
             while j < n:
-                c = MyDecimal(system.planes[i].normal_vector[j])
-                if c.is_near_zero():
+                if not system.planes[i].has_nonzero(j):
                     row_with_nonzero = system.find_idx_with_nonzero(j, i)
                     if row_with_nonzero:
                         system.swap_rows(i, row_with_nonzero)
+                        if plan is not None:
+                            plan.add_step(EliminationPlan.SWAP, i, row_with_nonzero)
                     else:
+                        if plan is not None:
+                            plan.add_step(EliminationPlan.SKIP, i, j)
                         j += 1
                         continue;
                         
                 system.clear_var(i,j)
+                if plan is not None:
+                    plan.add_step(EliminationPlan.CLEAR_BELOW, i, j)
                 
                 j += 1
                 break;
@@ -246,9 +334,18 @@ class LinearSystem(object):
             
         return system
     
-    def solve(self):
+    @in_decimal_context
+    def solve(self, plan=None, cache=None):
         """Returns the solution of this system of equation.
         
+        Args:
+            plan(elimination_plan.EliminationPlan): A plan recorded on a system
+                with the same structure. If provided, it is replayed instead 
+                of searching for pivots.
+                
+            cache(solve_cache.SolveCache): If provided, the solution is looked
+                up in it first and stored in it after solving.
+        
         Returns:
             vector.Vector: If there is an unique solution, will return a vector
                 representing the x,y,z points of the solution.
@@ -256,8 +353,14 @@ class LinearSystem(object):
             bool: False if there is no solution and True if there are many 
                 solutions.
         """
-        rref = self.compute_rref()
-        unique_solution = ['0','0','0']
+        if cache is not None:
+            return cache.get_or_compute(self, lambda: self.solve(plan))
+        
+        if plan is None:
+            rref = self.compute_rref()
+        else:
+            rref = self.compute_rref_with_plan(plan)
+        unique_solution = ['0']*self.dimension
         first_nonzeros = rref.indices_of_first_nonzero_terms_in_each_row()
         response = None
         one_variable_alone = False
@@ -265,8 +368,7 @@ class LinearSystem(object):
         
         for i,plane in enumerate(rref.planes):
             pivot_var_idx = first_nonzeros[i]    
-            constant_term = MyDecimal(plane.constant_term)
-            if(pivot_var_idx < 0 and not constant_term.is_near_zero() ):
+            if(pivot_var_idx < 0 and not get_policy().is_near_zero(plane.constant_term)):
                 return False
             
             number_of_vars = rref[i].var_count()
@@ -288,18 +390,82 @@ class LinearSystem(object):
         
         return response 
     
-    def compute_rref(self):
+    def solve_float(self, kernels=None, pivoting=None, equilibrate=False):
+        """Returns the solution of this system computed in floating point.
+        
+        The elimination of compute_rref runs in the float kernels of the 
+        kernels module, compiled with numba when it is available. The 
+        result follows the same rules as solve.
+        
+        With a pivoting strategy the elimination of pivoting.eliminate is 
+        used instead, whose zero test is relative to the biggest coefficient.
+        The result follows the rules of solve too, whatever the strategy. 
+        eliminate_float returns its growth factor and permutations as well.
+        
+        Args:
+            kernels(kernels.KernelSet): The kernels to use. Defaults to 
+                kernels.get_kernels().
+            
+            pivoting: A strategy of the pivoting module: 'first_nonzero', 
+                'partial', 'rook', 'complete' or a select function.
+            
+            equilibrate(bool): Scale rows and columns before eliminating. 
+                Implies partial pivoting if no strategy is given.
+        
+        Returns:
+            list[float]: If there is an unique solution.
+            
+            bool: False if there is no solution and True if there are many 
+                solutions.
+        """
+        if pivoting is not None or equilibrate:
+            return self.eliminate_float(pivoting or PARTIAL, equilibrate).solution
+        
+        # The coefficients are converted to floats once, into a matrix.Matrix.
+        augmented = Matrix.from_linear_system(self)
+        
+        if kernels is None:
+            kernels = get_kernels()
+        
+        n = self.dimension
+        eps = get_policy().zero_eps
+        a = kernels.as_matrix(augmented)
+        pivots = kernels.as_pivots(len(self))
+        kernels.rref(a, pivots, eps)
+        return interpret_rref(a, pivots, n, eps)
+    
+    def eliminate_float(self, pivoting=PARTIAL, equilibrate=False):
+        """Solves this system in floating point with a pivoting strategy.
+        
+        Args:
+            pivoting: A strategy of the pivoting module: 'first_nonzero', 
+                'partial', 'rook', 'complete' or a select function.
+            
+            equilibrate(bool): Scale rows and columns before eliminating.
+        
+        Returns:
+            pivoting.EliminationResult: The solution, following the rules of 
+                solve, the rank, the growth factor and the permutations.
+        """
+        return eliminate(Matrix.from_linear_system(self).tolist(), pivoting, equilibrate)
+    
+    @in_decimal_context
+    def compute_rref(self, plan=None):
         """Returns a copy of this system in Reduced Row-Echelon Form:
         
             Reduced Row-Echelon means that if possible every variable will
             have a coefficient of 1 and will be the only variable in each 
             equation.
             
+            Args:
+                plan(elimination_plan.EliminationPlan): If provided, the row 
+                    operations used are recorded in it.
+            
             Returns:
                 lin_sys.LinearSystem: Returns a copy of this system in Reduced 
                                       Row-Echelon Form.
         """
-        rref = self.compute_triangular_form()
+        rref = self.compute_triangular_form(plan)
         
         start_idx = len(rref.planes) -1
         end_idx = 0 -1
@@ -313,8 +479,36 @@ class LinearSystem(object):
             if(has_no_nonzero):
                 continue;
             rref.coef_to_one(i,first_nonzero)
-            rref.remove_var_above(first_nonzero,i)       
+            rref.remove_var_above(first_nonzero,i)
+            if plan is not None:
+                plan.add_step(EliminationPlan.COEF_TO_ONE, i, first_nonzero)
+                plan.add_step(EliminationPlan.CLEAR_ABOVE, first_nonzero, i)
         return rref
+    
+    @in_decimal_context
+    def compute_rref_with_plan(self, plan):
+        """Returns a copy of this system in Reduced Row-Echelon Form replaying a plan.
+        
+            The plan is replayed without searching for pivots. If the system 
+            does not have the structure of the plan or one of its pivots is 
+            zero, the form is computed with compute_rref instead.
+            
+            Args:
+                plan(elimination_plan.EliminationPlan): A plan recorded on a 
+                    system with the same structure.
+            
+            Returns:
+                lin_sys.LinearSystem: Returns a copy of this system in Reduced 
+                                      Row-Echelon Form.
+        """
+        try:
+            return plan.replay(self)
+        except Exception as e:
+            if str(e) in (EliminationPlan.INCOMPATIBLE_SYSTEM_MSG,
+                          EliminationPlan.PIVOT_IS_ZERO_MSG,
+                          EliminationPlan.SKIPPED_COLUMN_IS_NONZERO_MSG):
+                return self.compute_rref()
+            raise e
         
     def remove_var_above(self,var_idx,row):
         """Remove variable in "var_idx" index from all rows above "row"
@@ -364,9 +558,7 @@ class LinearSystem(object):
                 
         """
         for i in range(start_idx, len(self.planes)):
-            row_var_value = self.planes[i].normal_vector[coeficient_idx]
-            row_var_value = MyDecimal(row_var_value)
-            if(not row_var_value.is_near_zero()):
+            if self.planes[i].has_nonzero(coeficient_idx):
                 return i
         
         
@@ -400,9 +592,9 @@ class LinearSystem(object):
             that added to eq2, will eliminate eq2's variable in index "col".
             
             Args: 
-                eq1(plane.Plane): The first plane.
+                eq1(hyperplane.Hyperplane): The first equation.
                 
-                eq2(plane.Plane): Secod plane.
+                eq2(hyperplane.Hyperplane): Secod equation.
                 
                 col(int): The column from which to calculate the coefficient.
                 
@@ -0,0 +1,149 @@
+from collections import namedtuple
+
+import numpy as np
+
+""""Batch line intersection documentation.
+
+Vectorized version of line.Line.get_intersection_with for every pair between
+two sets of lines. Each line Ax + By = K is a row [A, B, K] of an array and
+the intersection points are computed with Cramer's rule on whole tiles of
+pairs at once. Parallel and coincident pairs are reported with masks instead
+of the None/self return values of Line.get_intersection_with.
+
+The pairs are processed in square tiles of at most tile_size x tile_size, so
+iter_intersection_tiles works in bounded memory however many lines there are.
+intersect_all_pairs assembles the tiles into full (M, N) results.
+
+Examples:
+    points, parallel, coincident = intersect_all_pairs(lines_a, lines_b)
+
+    for rows, cols, tile in iter_intersection_tiles(lines_a, lines_b, tile_size=1024):
+        store(rows, cols, tile.points[~tile.parallel])
+
+"""
+
+
+LineIntersections = namedtuple('LineIntersections', ['points', 'parallel', 'coincident'])
+LineIntersections.__doc__ = """Intersections between two sets of lines.
+
+    Attributes:
+        points(numpy.ndarray): Shape (M, N, 2). The x and y of the intersection
+            of line i of the first set with line j of the second one. nan for
+            parallel pairs.
+
+        parallel(numpy.ndarray): Shape (M, N) of bools. True where the lines are
+            parallel, including coincident lines. An equation with a zero
+            normal is parallel to every line, like in Vector.is_parallel_to.
+
+        coincident(numpy.ndarray): Shape (M, N) of bools. True where the lines
+            are the same. Equations with a zero normal are only the same as
+            each other, when their constant terms are equal.
+"""
+
+
+def lines_to_array(lines):
+    """Returns the equations of lines as an array.
+
+        Args:
+            lines(list[line.Line]): The lines. An array of shape (n, 3) is
+                                    returned as a float array.
+
+        Returns:
+            numpy.ndarray: Shape (n, 3). Each row is [A, B, K].
+    """
+    if isinstance(lines, np.ndarray):
+        return np.asarray(lines, dtype=float)
+    return np.array([[float(l.normal_vector[0]), float(l.normal_vector[1]), float(l.constant_term)]
+                     for l in lines], dtype=float).reshape(-1, 3)
+
+
+def _normalise(equations, tolerance):
+    # Normals not bigger than tolerance are zero, like Vector.is_zero, and
+    # keep their constant term unscaled.
+    norms = np.hypot(equations[:, 0], equations[:, 1])
+    zero = norms <= tolerance
+    equations = equations / np.where(zero, 1.0, norms)[:, None]
+    equations[zero, :2] = 0.0
+    return equations
+
+
+def _intersect_tile(a, b, tolerance):
+    a1, b1, k1 = a[:, 0, None], a[:, 1, None], a[:, 2, None]
+    a2, b2, k2 = b[None, :, 0], b[None, :, 1], b[None, :, 2]
+
+    determinant = a1 * b2 - b1 * a2
+    parallel = np.abs(determinant) <= tolerance
+    coincident = parallel & (np.abs(a1 * k2 - a2 * k1) <= tolerance) & (np.abs(b1 * k2 - b2 * k1) <= tolerance)
+
+    # Like Hyperplane.is_same_as: two zero normals are the same equation only
+    # with the same constant term and a zero normal is never the same as a line.
+    zero_a = (a1 == 0) & (b1 == 0)
+    zero_b = (a2 == 0) & (b2 == 0)
+    coincident = np.where(zero_a | zero_b, zero_a & zero_b & (np.abs(k1 - k2) <= tolerance), coincident)
+
+    safe_determinant = np.where(parallel, 1.0, determinant)
+    points = np.empty(determinant.shape + (2,))
+    points[..., 0] = (b2 * k1 - b1 * k2) / safe_determinant
+    points[..., 1] = (a1 * k2 - a2 * k1) / safe_determinant
+    points[parallel] = np.nan
+
+    return LineIntersections(points, parallel, coincident)
+
+
+def iter_intersection_tiles(lines_a, lines_b, tile_size=1024, tolerance=1e-10):
+    """Yields the intersections between two sets of lines tile by tile.
+
+        Args:
+            lines_a(list[line.Line]): The first set, or an array of shape (M, 3).
+
+            lines_b(list[line.Line]): The second set, or an array of shape (N, 3).
+
+            tile_size(int): The maximum number of lines of each set per tile.
+
+            tolerance(float): Pairs whose unit normals have a cross product not
+                              bigger than this are parallel. Normals and
+                              differences of constant terms not bigger than
+                              this are zero.
+
+        Yields:
+            tuple: (rows, cols, intersections) where rows and cols are the
+                   slices of lines_a and lines_b covered by the tile and
+                   intersections is a LineIntersections for the tile.
+    """
+    a = _normalise(lines_to_array(lines_a), tolerance)
+    b = _normalise(lines_to_array(lines_b), tolerance)
+    for i in range(0, len(a), tile_size):
+        rows = slice(i, min(i + tile_size, len(a)))
+        for j in range(0, len(b), tile_size):
+            cols = slice(j, min(j + tile_size, len(b)))
+            yield rows, cols, _intersect_tile(a[rows], b[cols], tolerance)
+
+
+def intersect_all_pairs(lines_a, lines_b, tile_size=1024, tolerance=1e-10):
+    """Returns the intersections between every line of lines_a and every line of lines_b.
+
+        Args:
+            lines_a(list[line.Line]): The first set, or an array of shape (M, 3).
+
+            lines_b(list[line.Line]): The second set, or an array of shape (N, 3).
+
+            tile_size(int): The maximum number of lines of each set per tile.
+
+            tolerance(float): Pairs whose unit normals have a cross product not
+                              bigger than this are parallel. Normals and
+                              differences of constant terms not bigger than
+                              this are zero.
+
+        Returns:
+            LineIntersections: The points and masks of every pair.
+    """
+    a = lines_to_array(lines_a)
+    b = lines_to_array(lines_b)
+    points = np.empty((len(a), len(b), 2))
+    parallel = np.empty((len(a), len(b)), dtype=bool)
+    coincident = np.empty((len(a), len(b)), dtype=bool)
+    for rows, cols, tile in iter_intersection_tiles(a, b, tile_size, tolerance):
+        points[rows, cols] = tile.points
+        parallel[rows, cols] = tile.parallel
+        coincident[rows, cols] = tile.coincident
+    return LineIntersections(points, parallel, coincident)
@@ -0,0 +1,174 @@
+from decimal import Decimal
+
+from math_util import in_decimal_context
+
+""""LUFactorization class documentation.
+
+This class is the LU factorization with partial pivoting of a matrix given as
+a list of rows. The elimination runs once when the factorization is created
+and the determinant, inverse, rank and solutions are all derived from it.
+
+Examples:
+    Factorize once and query many times:
+
+    lu = LUFactorization([['2','1'],['4','3']])
+
+    lu.determinant()  # Decimal('2')
+    lu.rank()         # 2
+    lu.inverse()      # [[Decimal('1.5'), Decimal('-0.5')], [Decimal('-2'), Decimal('1')]]
+
+
+Attributes:
+    num_rows(int): Number of rows of the factorized matrix.
+
+    num_cols(int): Number of columns of the factorized matrix.
+
+    permutation(list[int]): permutation[i] is the row of the original matrix
+        that ended in row i.
+
+    pivot_columns(list[int]): The column of the pivot of each nonzero row of U.
+
+    tolerance(Decimal): Pivots whose absolute value is not bigger than this
+        are considered zero.
+
+"""
+
+
+class LUFactorization(object):
+
+    NOT_SQUARE_MSG = 'The matrix is not square'
+    SINGULAR_MATRIX_MSG = 'The matrix is singular'
+    WRONG_SIZE_MSG = 'The right hand side does not have a value per row'
+
+    @in_decimal_context
+    def __init__(self, rows, tolerance='1e-10'):
+        """Factorize the matrix.
+
+            Args:
+                rows(list[list]): The rows of the matrix. Values are converted
+                                  to Decimal.
+
+                tolerance(Decimal): Pivots not bigger than this are considered
+                                    zero.
+        """
+        self.tolerance = Decimal(str(tolerance))
+        self._lu = [[Decimal(value) for value in row] for row in rows]
+        self.num_rows = len(self._lu)
+        self.num_cols = len(self._lu[0]) if self._lu else 0
+        self.permutation = list(range(self.num_rows))
+        self.pivot_columns = []
+        self._sign = 1
+        self._factorize()
+
+    def _factorize(self):
+        a = self._lu
+        m, n = self.num_rows, self.num_cols
+        r = 0
+        for c in range(n):
+            if r == m:
+                break
+            p = max(range(r, m), key=lambda i: abs(a[i][c]))
+            if abs(a[p][c]) <= self.tolerance:
+                continue
+            if p != r:
+                a[p], a[r] = a[r], a[p]
+                self.permutation[p], self.permutation[r] = self.permutation[r], self.permutation[p]
+                self._sign = -self._sign
+
+            pivot_row = a[r]
+            pivot = pivot_row[c]
+            for i in range(r + 1, m):
+                row = a[i]
+                factor = row[c] / pivot
+                row[c] = factor
+                if factor:
+                    for k in range(c + 1, n):
+                        row[k] -= factor * pivot_row[k]
+
+            self.pivot_columns.append(c)
+            r += 1
+
+    def rank(self):
+        """Returns the rank of the matrix.
+
+            Returns:
+                int: The number of linearly independent rows.
+        """
+        return len(self.pivot_columns)
+
+    def is_singular(self):
+        """Returns True if the matrix is square and singular.
+
+            Raises:
+                Exception: If the matrix is not square.
+        """
+        self._check_square()
+        return self.rank() < self.num_rows
+
+    @in_decimal_context
+    def determinant(self):
+        """Returns the determinant of the matrix.
+
+            Returns:
+                Decimal: The determinant. Zero if the matrix is singular.
+
+            Raises:
+                Exception: If the matrix is not square.
+        """
+        if self.is_singular():
+            return Decimal('0')
+        result = Decimal(self._sign)
+        for i in range(self.num_rows):
+            result *= self._lu[i][i]
+        return result
+
+    @in_decimal_context
+    def solve(self, b):
+        """Returns x such that the matrix multiplied by x equals b.
+
+            Args:
+                b(list): One value per row of the matrix.
+
+            Returns:
+                list[Decimal]: The solution.
+
+            Raises:
+                Exception: If the matrix is not square, is singular or b has
+                           the wrong size.
+        """
+        if self.is_singular():
+            raise Exception(self.SINGULAR_MATRIX_MSG)
+        if len(b) != self.num_rows:
+            raise Exception(self.WRONG_SIZE_MSG)
+
+        a = self._lu
+        n = self.num_rows
+        y = [Decimal(b[self.permutation[i]]) for i in range(n)]
+        for i in range(n):
+            row = a[i]
+            for k in range(i):
+                y[i] -= row[k] * y[k]
+        for i in range(n - 1, -1, -1):
+            row = a[i]
+            for k in range(i + 1, n):
+                y[i] -= row[k] * y[k]
+            y[i] /= row[i]
+        return y
+
+    @in_decimal_context
+    def inverse(self):
+        """Returns the inverse of the matrix as a list of rows.
+
+            Returns:
+                list[list[Decimal]]: The inverse.
+
+            Raises:
+                Exception: If the matrix is not square or is singular.
+        """
+        n = self.num_rows
+        columns = [self.solve([1 if i == j else 0 for i in range(n)]) for j in range(n)]
+        return [[columns[j][i] for j in range(n)] for i in range(n)]
+
+    def _check_square(self):
+        if self.num_rows != self.num_cols:
+            raise Exception(self.NOT_SQUARE_MSG)
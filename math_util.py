@@ -1,12 +1,263 @@
+import contextlib
+import contextvars
+import functools
+import struct
+from decimal import Decimal, getcontext, localcontext
+
+""""Tolerance policy documentation.
+
+The tolerances used to decide when a number is zero or two numbers are equal
+live in one TolerancePolicy object shared by vector.Vector, the hyperplanes
+(line.Line, plane.Plane) and lin_sys.LinearSystem. Its comparisons take ints,
+floats, Decimals or numpy arrays: the tolerances are kept both as float and
+as Decimal, so Decimal values are compared without converting them on every
+call, and arrays are compared element-wise in one pass.
+
+The policy in use is get_policy(). It can be replaced for a block of code,
+and only for the current thread or task, with using_policy.
+
+The precision of the Decimal arithmetic is chosen the same way, with
+get_precision and using_precision. The Decimal code paths of the solver,
+and the arithmetic of vector.Vector and hyperplane.Hyperplane, are decorated
+with in_decimal_context, so they run in a local decimal context with that
+precision and never change the context of the caller or of other threads.
+
+Examples:
+    policy = get_policy()
+    policy.is_near_zero(Decimal('0.001'))     # True, zero_eps is 1e-2
+    policy.near_zero_mask(numpy_array)        # bool array
+
+    with using_policy(TolerancePolicy(zero_eps=1e-10)):
+        system.solve()
+
+    with using_precision(50):
+        system.solve()
+
+"""
+
+
+def _is_array(value):
+    return hasattr(value, 'shape') and hasattr(value, 'dtype')
+
+
+def _numpy():
+    import backends
+    return backends.get_backend('numpy')
+
+
+def _ordered_bits(value):
+    # Map the bits of a double to an int that grows with the double, so the
+    # difference of two of them is their distance in units in the last place.
+    bits = struct.unpack('<q', struct.pack('<d', float(value)))[0]
+    return bits if bits >= 0 else -(bits & 0x7FFFFFFFFFFFFFFF)
+
+
+class TolerancePolicy(object):
+
+    def __init__(self, zero_eps=1e-2, magnitude_eps=1e-10, abs_tol=1e-9, rel_tol=0.0, max_ulps=4):
+        """Initialize the policy. The tolerances can't be changed afterwards.
+
+            Args:
+                zero_eps(float): Coefficients of equations whose absolute value
+                                 is smaller than this are zero. It is coarse
+                                 because elimination accumulates errors in the
+                                 coefficients.
+
+                magnitude_eps(float): Modules and dot products not bigger than
+                                      this are zero.
+
+                abs_tol(float): Absolute tolerance of isclose.
+
+                rel_tol(float): Relative tolerance of isclose.
+
+                max_ulps(int): Maximum distance in units in the last place of
+                               isclose_ulps.
+        """
+        self.zero_eps = float(zero_eps)
+        self.magnitude_eps = float(magnitude_eps)
+        self.abs_tol = float(abs_tol)
+        self.rel_tol = float(rel_tol)
+        self.max_ulps = int(max_ulps)
+        self._decimal = {'zero_eps': Decimal(repr(self.zero_eps)),
+                         'magnitude_eps': Decimal(repr(self.magnitude_eps)),
+                         'abs_tol': Decimal(repr(self.abs_tol)),
+                         'rel_tol': Decimal(repr(self.rel_tol))}
+
+    def _tolerance(self, name, value, like):
+        if value is None:
+            if isinstance(like, Decimal):
+                return self._decimal[name]
+            return getattr(self, name)
+        if isinstance(like, Decimal) and isinstance(value, float):
+            return Decimal(repr(value))
+        return value
+
+    def is_near_zero(self, value, eps=None):
+        """Returns True if abs(value) < eps.
+
+            Args:
+                value: An int, float, Decimal or array.
+
+                eps(float): Defaults to zero_eps.
+
+            Returns:
+                bool: Or a bool array for array values.
+        """
+        return abs(value) < self._tolerance('zero_eps', eps, value)
+
+    def near_zero_mask(self, values, eps=None):
+        """Returns a bool array that is True where abs(values) < eps.
+
+            Args:
+                values(array_like): The values to check.
+
+                eps(float): Defaults to zero_eps.
+        """
+        np = _numpy()
+        return np.abs(np.asarray(values, dtype=float)) < (self.zero_eps if eps is None else eps)
+
+    def is_zero_magnitude(self, value, eps=None):
+        """Returns True if value <= eps, for modules and dot products.
+
+            Args:
+                value: An int, float, Decimal or array.
+
+                eps(float): Defaults to magnitude_eps.
+        """
+        return value <= self._tolerance('magnitude_eps', eps, value)
+
+    def isclose(self, a, b, rel_tol=None, abs_tol=None):
+        """Returns True if abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol).
+
+            Args:
+                a: An int, float, Decimal or array.
+
+                b: An int, float, Decimal or array.
+
+                rel_tol(float): Defaults to the policy's rel_tol.
+
+                abs_tol(float): Defaults to the policy's abs_tol.
+
+            Returns:
+                bool: Or a bool array if a or b are arrays.
+        """
+        if _is_array(a) or _is_array(b):
+            np = _numpy()
+            a = np.asarray(a, dtype=float)
+            b = np.asarray(b, dtype=float)
+            rel_tol = self.rel_tol if rel_tol is None else rel_tol
+            abs_tol = self.abs_tol if abs_tol is None else abs_tol
+            return np.abs(a - b) <= np.maximum(rel_tol * np.maximum(np.abs(a), np.abs(b)), abs_tol)
+
+        if isinstance(a, Decimal) != isinstance(b, Decimal):
+            a = float(a)
+            b = float(b)
+        rel_tol = self._tolerance('rel_tol', rel_tol, a)
+        abs_tol = self._tolerance('abs_tol', abs_tol, a)
+        difference = abs(a - b)
+        if not rel_tol:
+            return difference <= abs_tol
+        return difference <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
+
+    def isclose_ulps(self, a, b, max_ulps=None):
+        """Returns True if a and b, as doubles, are at most max_ulps representable values apart.
+
+            Args:
+                a: An int, float, Decimal or array.
+
+                b: An int, float, Decimal or array.
+
+                max_ulps(int): Defaults to the policy's max_ulps.
+
+            Returns:
+                bool: Or a bool array if a or b are arrays.
+        """
+        max_ulps = self.max_ulps if max_ulps is None else max_ulps
+        if _is_array(a) or _is_array(b):
+            np = _numpy()
+            a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+            bits = []
+            for values in (a, b):
+                raw = np.ascontiguousarray(values).view(np.int64)
+                bits.append(np.where(raw >= 0, raw, -(raw & 0x7FFFFFFFFFFFFFFF)))
+            return np.abs(bits[0] - bits[1]) <= max_ulps
+        return abs(_ordered_bits(a) - _ordered_bits(b)) <= max_ulps
+
+
+DEFAULT_POLICY = TolerancePolicy()
+
+_current_policy = contextvars.ContextVar('tolerance_policy', default=DEFAULT_POLICY)
+
+
+def get_policy():
+    """Returns the TolerancePolicy in use in the current thread or task."""
+    return _current_policy.get()
+
+
+@contextlib.contextmanager
+def using_policy(policy):
+    """Use policy in the current thread or task until the block ends.
+
+        Args:
+            policy(TolerancePolicy): The policy to use.
+    """
+    token = _current_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _current_policy.reset(token)
+
+
+DEFAULT_PRECISION = 30
+
+_current_precision = contextvars.ContextVar('decimal_precision', default=DEFAULT_PRECISION)
+
+
+def get_precision():
+    """Returns the Decimal precision in use in the current thread or task."""
+    return _current_precision.get()
+
+
+@contextlib.contextmanager
+def using_precision(precision):
+    """Use precision in the current thread or task until the block ends.
+
+        Args:
+            precision(int): Number of significant digits of the Decimal
+                            arithmetic of the solver.
+    """
+    token = _current_precision.set(precision)
+    try:
+        yield precision
+    finally:
+        _current_precision.reset(token)
+
+
+def in_decimal_context(function):
+    """Decorator that runs function in a local decimal context with get_precision().
+
+        The local context is only opened when the current one has another
+        precision, so nested calls don't pay for it.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        precision = _current_precision.get()
+        if getcontext().prec == precision:
+            return function(*args, **kwargs)
+        with localcontext() as context:
+            context.prec = precision
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def isclose(a, b, rel_tol=None, abs_tol=None):
+    return get_policy().isclose(a, b, rel_tol, abs_tol)
+
+
+def is_near_zero(value, eps=None):
+    return get_policy().is_near_zero(value, eps)
 
-from decimal import Decimal
 
-def isclose(a, b, rel_tol=0.0, abs_tol=1e-9):
-    a = float(a)
-    b= float(b)
-    return abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
-       
-    
 class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-2):
-        return abs(self) < eps
\ No newline at end of file
+    def is_near_zero(self, eps=None):
+        return get_policy().is_near_zero(self, eps)
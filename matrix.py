@@ -0,0 +1,301 @@
+import operator
+from array import array
+from decimal import Decimal
+
+from vector import Vector
+from hyperplane import Hyperplane
+
+""""Matrix class documentation.
+
+A dense matrix of floats. The values are stored contiguously in an
+array('d') and every matrix is a view on that storage described by an
+offset and a stride per axis, like numpy arrays: transposing, taking rows,
+columns or blocks returns a new view without copying the values. copy()
+returns a contiguous matrix.
+
+Matrix-vector products read each row as one slice of the storage. The
+matrix-matrix product is blocked: it works on tiles of block_size x
+block_size of the right hand matrix, which are read once and reused for every
+row of the left one while they are hot in the cache.
+
+It converts to and from lin_sys.LinearSystem (one row per equation, with the
+constant term in the last column), lists of vector.Vector (one per row) and,
+without copying, numpy arrays. LinearSystem.solve_float uses it to convert
+the equations to floats once and hands it to the kernels of kernels.py.
+
+Examples:
+    a = Matrix([[1, 2], [3, 4]])
+    a.T                        # transposed view, shares the values of a
+    a @ a.T                    # Matrix
+    a @ Vector(['1', '1'])     # Vector
+    a.matvec([1, 1])           # [3.0, 7.0]
+
+    augmented = Matrix.from_linear_system(system)
+    system = augmented.to_linear_system()
+
+
+Attributes:
+    num_rows(int): Number of rows.
+
+    num_cols(int): Number of columns.
+
+"""
+
+
+class Matrix(object):
+
+    WRONG_SHAPE_MSG = 'All the rows must have the same number of values'
+    INCOMPATIBLE_SHAPES_MSG = 'The number of columns of the left operand must be the number of rows of the right one'
+    NO_CONSTANT_TERM_MSG = 'The matrix needs a column for the constant terms'
+
+    __slots__ = ('num_rows', 'num_cols', '_data', '_offset', '_row_stride', '_col_stride')
+
+    def __init__(self, rows=None):
+        """Initialize the matrix with a copy of rows.
+
+            Args:
+                rows(list[list]): The rows of the matrix. Values are converted
+                                  to float.
+
+            Raises:
+                Exception: If the rows don't have the same number of values.
+        """
+        rows = [list(row) for row in rows or []]
+        num_cols = len(rows[0]) if rows else 0
+        if any(len(row) != num_cols for row in rows):
+            raise Exception(self.WRONG_SHAPE_MSG)
+        data = array('d')
+        for row in rows:
+            data.extend(float(value) for value in row)
+        self._set_view(data, 0, len(rows), num_cols, num_cols, 1)
+
+    def _set_view(self, data, offset, num_rows, num_cols, row_stride, col_stride):
+        self._data = data
+        self._offset = offset
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._row_stride = row_stride
+        self._col_stride = col_stride
+
+    @classmethod
+    def _view(cls, data, offset, num_rows, num_cols, row_stride, col_stride):
+        matrix = cls.__new__(cls)
+        matrix._set_view(data, offset, num_rows, num_cols, row_stride, col_stride)
+        return matrix
+
+    @classmethod
+    def zeros(cls, num_rows, num_cols):
+        """Returns a contiguous matrix of zeros."""
+        return cls._view(array('d', bytes(8 * num_rows * num_cols)), 0, num_rows, num_cols, num_cols, 1)
+
+    @classmethod
+    def identity(cls, size):
+        """Returns the identity matrix of size x size."""
+        matrix = cls.zeros(size, size)
+        for i in range(size):
+            matrix._data[i * size + i] = 1.0
+        return matrix
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """Returns a matrix with a vector per row.
+
+            Args:
+                vectors(list[vector.Vector]): The rows.
+        """
+        return cls([v.coordinates for v in vectors])
+
+    @classmethod
+    def from_linear_system(cls, system, augmented=True):
+        """Returns the matrix of the equations of a system.
+
+            Args:
+                system(lin_sys.LinearSystem): The system.
+
+                augmented(bool): If True the last column holds the constant
+                                 terms.
+        """
+        if augmented:
+            return cls([list(p.normal_vector) + [p.constant_term] for p in system.planes])
+        return cls([p.normal_vector.coordinates for p in system.planes])
+
+    def to_vectors(self):
+        """Returns the rows as a list of vector.Vector."""
+        return [Vector([Decimal(repr(value)) for value in row]) for row in self.tolist()]
+
+    def to_linear_system(self):
+        """Returns the system whose equations are the rows of this augmented matrix.
+
+            Returns:
+                lin_sys.LinearSystem: One equation per row, the last column is
+                                      the constant term.
+
+            Raises:
+                Exception: If the matrix has less than two columns.
+        """
+        from lin_sys import LinearSystem
+        if self.num_cols < 2:
+            raise Exception(self.NO_CONSTANT_TERM_MSG)
+        return LinearSystem([Hyperplane(Vector([Decimal(repr(value)) for value in row[:-1]]),
+                                        Decimal(repr(row[-1])))
+                             for row in self.tolist()])
+
+    def to_numpy(self):
+        """Returns a numpy array that shares the values of this matrix."""
+        import backends
+        np = backends.get_backend('numpy')
+        base = np.frombuffer(self._data, dtype=np.float64)
+        return np.lib.stride_tricks.as_strided(base[self._offset:], shape=self.shape,
+                                               strides=(8 * self._row_stride, 8 * self._col_stride))
+
+    @property
+    def shape(self):
+        """tuple: (num_rows, num_cols)."""
+        return (self.num_rows, self.num_cols)
+
+    @property
+    def T(self):
+        """Matrix: The transposed matrix, a view sharing the values of this one."""
+        return self.transpose()
+
+    def transpose(self):
+        """Returns the transposed matrix. It is a view: no values are copied."""
+        return self._view(self._data, self._offset, self.num_cols, self.num_rows,
+                          self._col_stride, self._row_stride)
+
+    def is_contiguous(self):
+        """Returns True if the rows are stored one after the other."""
+        return self._col_stride == 1 and (self._row_stride == self.num_cols or self.num_rows <= 1)
+
+    def copy(self):
+        """Returns a contiguous copy of this matrix."""
+        data = array('d')
+        for i in range(self.num_rows):
+            data.extend(self._row_values(i))
+        return self._view(data, 0, self.num_rows, self.num_cols, self.num_cols, 1)
+
+    def block(self, row, col, num_rows, num_cols):
+        """Returns the num_rows x num_cols block starting at (row, col). It is a view."""
+        if row < 0 or col < 0 or row + num_rows > self.num_rows or col + num_cols > self.num_cols:
+            raise IndexError
+        return self._view(self._data, self._index(row, col), num_rows, num_cols,
+                          self._row_stride, self._col_stride)
+
+    def row(self, i):
+        """Returns row i as a 1 x num_cols view."""
+        return self.block(i, 0, 1, self.num_cols)
+
+    def column(self, j):
+        """Returns column j as a num_rows x 1 view."""
+        return self.block(0, j, self.num_rows, 1)
+
+    def _index(self, i, j):
+        return self._offset + i * self._row_stride + j * self._col_stride
+
+    def _row_values(self, i, start=0, stop=None):
+        # Row i, columns start to stop, as one (possibly strided) slice of the storage.
+        stop = self.num_cols if stop is None else stop
+        if stop <= start:
+            return array('d')
+        first = self._index(i, start)
+        return self._data[first:first + (stop - start - 1) * self._col_stride + 1:self._col_stride]
+
+    def __getitem__(self, key):
+        """Returns the value at key.
+
+            Args:
+                key(tuple): (row, column).
+
+            Raises:
+                IndexError: If the position is outside of the matrix.
+        """
+        i, j = key
+        if not (0 <= i < self.num_rows and 0 <= j < self.num_cols):
+            raise IndexError
+        return self._data[self._index(i, j)]
+
+    def __setitem__(self, key, value):
+        i, j = key
+        if not (0 <= i < self.num_rows and 0 <= j < self.num_cols):
+            raise IndexError
+        self._data[self._index(i, j)] = float(value)
+
+    def __len__(self):
+        return self.num_rows
+
+    def __eq__(self, other):
+        return isinstance(other, Matrix) and self.shape == other.shape and self.tolist() == other.tolist()
+
+    def tolist(self):
+        """Returns the rows as lists of floats."""
+        return [self._row_values(i).tolist() for i in range(self.num_rows)]
+
+    def __str__(self):
+        return 'Matrix: {}'.format(self.tolist())
+
+    def matvec(self, values):
+        """Returns the product of this matrix and a column of values.
+
+            Args:
+                values(list): num_cols numbers.
+
+            Returns:
+                list[float]: num_rows values.
+
+            Raises:
+                Exception: If values doesn't have num_cols numbers.
+        """
+        values = [float(value) for value in values]
+        if len(values) != self.num_cols:
+            raise Exception(self.INCOMPATIBLE_SHAPES_MSG)
+        return [sum(map(operator.mul, self._row_values(i), values)) for i in range(self.num_rows)]
+
+    def matmul(self, other, block_size=64):
+        """Returns the product of this matrix and other.
+
+            Args:
+                other(Matrix): The right hand matrix.
+
+                block_size(int): Side of the tiles of other that are reused
+                                 for every row of this matrix.
+
+            Returns:
+                Matrix: A contiguous num_rows x other.num_cols matrix.
+
+            Raises:
+                Exception: If num_cols isn't the number of rows of other.
+        """
+        if self.num_cols != other.num_rows:
+            raise Exception(self.INCOMPATIBLE_SHAPES_MSG)
+        m, n, p = self.num_rows, self.num_cols, other.num_cols
+        out = array('d', bytes(8 * m * p))
+        left = [self._row_values(i).tolist() for i in range(m)] if m * n else []
+
+        columns_of_other = other.transpose()
+        for j0 in range(0, p, block_size):
+            j1 = min(j0 + block_size, p)
+            for k0 in range(0, n, block_size):
+                k1 = min(k0 + block_size, n)
+                tile = [columns_of_other._row_values(j, k0, k1).tolist() for j in range(j0, j1)]
+                for i in range(m):
+                    segment = left[i][k0:k1]
+                    # Accumulate in place in the result, without a list per (i, k).
+                    for j, column in enumerate(tile, i * p + j0):
+                        out[j] += sum(map(operator.mul, segment, column))
+
+        return self._view(out, 0, m, p, p, 1)
+
+    def __matmul__(self, other):
+        """Returns self @ other.
+
+            Args:
+                other: A Matrix or a vector.Vector.
+
+            Returns:
+                Matrix: For a Matrix.
+
+                vector.Vector: For a Vector.
+        """
+        if isinstance(other, Vector):
+            return Vector([Decimal(repr(value)) for value in self.matvec(other.coordinates)])
+        return self.matmul(other)
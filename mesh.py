@@ -0,0 +1,140 @@
+from collections import namedtuple
+
+import numpy as np
+
+""""Triangle mesh documentation.
+
+Vectorized version of vector.Vector.cross_product and area_of_triangle for
+whole triangle meshes. A mesh is an array of vertices of shape (V, 3), or
+(V, 2) for flat meshes, which are taken with z = 0 like in cross_product,
+and an int array of faces of shape (F, 3) with the indexes of the vertices
+of each triangle.
+
+mesh_properties computes, from one cross product per face, the unit normal
+and area of every face, the total area and the normal of every vertex, which
+is the sum of the normals of its faces weighted by their areas, normalised.
+The faces are processed in chunks of chunk_size so the temporary arrays stay
+bounded for meshes with millions of triangles.
+
+Degenerate faces (zero area) have a zero normal, and so have the vertices
+that only belong to degenerate faces or to none.
+
+Examples:
+    vertices = numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    faces = numpy.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+
+    properties = mesh_properties(vertices, faces)
+    properties.face_areas       # shape (4,)
+    properties.total_area       # float
+
+"""
+
+
+WRONG_VERTICES_SHAPE_MSG = 'The vertices must be an array of shape (V, 2) or (V, 3)'
+WRONG_FACES_SHAPE_MSG = 'The faces must be an int array of shape (F, 3)'
+FACE_INDEX_OUT_OF_RANGE_MSG = 'The faces refer to vertices that do not exist'
+
+CHUNK_SIZE = 1 << 20
+
+MeshProperties = namedtuple('MeshProperties', ['face_normals', 'face_areas', 'vertex_normals', 'total_area'])
+MeshProperties.__doc__ = """Normals and areas of a triangle mesh.
+
+    Attributes:
+        face_normals(numpy.ndarray): Shape (F, 3). The unit normal of every
+            face, following the order of its vertices (right hand rule).
+
+        face_areas(numpy.ndarray): Shape (F,).
+
+        vertex_normals(numpy.ndarray): Shape (V, 3). The area weighted unit
+            normal of every vertex.
+
+        total_area(float): The sum of the areas of the faces.
+"""
+
+
+def as_mesh_arrays(vertices, faces):
+    """Returns the vertices as a float array of shape (V, 3) and the faces as an int array.
+
+        Raises:
+            ValueError: If the shapes are wrong or a face refers to a vertex
+                        that doesn't exist.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces)
+    if vertices.ndim != 2 or vertices.shape[1] not in (2, 3):
+        raise ValueError(WRONG_VERTICES_SHAPE_MSG)
+    if faces.ndim != 2 or faces.shape[1] != 3 or (faces.size and faces.dtype.kind not in 'iu'):
+        raise ValueError(WRONG_FACES_SHAPE_MSG)
+    if faces.size and (faces.min() < 0 or faces.max() >= len(vertices)):
+        raise ValueError(FACE_INDEX_OUT_OF_RANGE_MSG)
+    if vertices.shape[1] == 2:
+        vertices = np.hstack([vertices, np.zeros((len(vertices), 1))])
+    return vertices, faces.astype(np.intp, copy=False)
+
+
+def _face_cross_products(vertices, faces):
+    first = vertices[faces[:, 0]]
+    return np.cross(vertices[faces[:, 1]] - first, vertices[faces[:, 2]] - first)
+
+
+def mesh_properties(vertices, faces, chunk_size=CHUNK_SIZE):
+    """Returns the face normals and areas, vertex normals and total area of a mesh.
+
+        Args:
+            vertices(array_like): Shape (V, 3) or (V, 2).
+
+            faces(array_like): Shape (F, 3) of vertex indexes.
+
+            chunk_size(int): Number of faces processed at once.
+
+        Returns:
+            MeshProperties: The normals and areas.
+
+        Raises:
+            ValueError: If the shapes are wrong or a face refers to a vertex
+                        that doesn't exist.
+    """
+    vertices, faces = as_mesh_arrays(vertices, faces)
+    face_normals = np.zeros((len(faces), 3))
+    face_areas = np.zeros(len(faces))
+    vertex_normals = np.zeros((len(vertices), 3))
+
+    for start in range(0, len(faces), chunk_size):
+        chunk = faces[start:start + chunk_size]
+        cross = _face_cross_products(vertices, chunk)
+        double_areas = np.sqrt(np.einsum('ij,ij->i', cross, cross))
+        face_areas[start:start + len(chunk)] = 0.5 * double_areas
+        nonzero = double_areas > 0
+        face_normals[start:start + len(chunk)][nonzero] = cross[nonzero] / double_areas[nonzero, None]
+        # The cross product is already the normal times twice the area.
+        indexes = chunk.ravel()
+        for axis in range(3):
+            vertex_normals[:, axis] += np.bincount(indexes, weights=np.repeat(cross[:, axis], 3),
+                                                   minlength=len(vertices))
+
+    lengths = np.sqrt(np.einsum('ij,ij->i', vertex_normals, vertex_normals))
+    nonzero = lengths > 0
+    vertex_normals[nonzero] /= lengths[nonzero, None]
+    return MeshProperties(face_normals, face_areas, vertex_normals, float(face_areas.sum()))
+
+
+def face_normals(vertices, faces):
+    """Returns the unit normal of every face, shape (F, 3)."""
+    return mesh_properties(vertices, faces).face_normals
+
+
+def face_areas(vertices, faces):
+    """Returns the area of every face, shape (F,)."""
+    vertices, faces = as_mesh_arrays(vertices, faces)
+    cross = _face_cross_products(vertices, faces)
+    return 0.5 * np.sqrt(np.einsum('ij,ij->i', cross, cross))
+
+
+def vertex_normals(vertices, faces):
+    """Returns the area weighted unit normal of every vertex, shape (V, 3)."""
+    return mesh_properties(vertices, faces).vertex_normals
+
+
+def total_area(vertices, faces):
+    """Returns the area of the mesh."""
+    return float(face_areas(vertices, faces).sum())
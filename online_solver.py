@@ -0,0 +1,221 @@
+from bisect import bisect_left
+from collections import namedtuple
+from decimal import Decimal
+
+from vector import Vector
+from hyperplane import Hyperplane
+from math_util import get_policy, in_decimal_context
+
+""""OnlineSolver class documentation.
+
+Incremental solve of a system whose equations arrive one at a time. The
+solver keeps the accepted equations in Reduced Row-Echelon Form: every row
+has a pivot variable with coefficient 1 that is zero in the other rows. A new
+equation is reduced against the rows, O(rank * dimension), and then it is
+either:
+
+    REDUNDANT      A combination of the previous equations. It is dropped.
+    INCONSISTENT   Its coefficients cancel but its constant term doesn't, so
+                   the system has no solution any more. It is dropped and
+                   kept in conflicts.
+    INDEPENDENT    It adds a pivot, on its biggest remaining coefficient, and
+                   its variable is removed from the other rows.
+
+So the rank, the consistency and whether the solution is unique are known
+after every equation, and solution() and parametrization() only read the
+rows. Coefficients smaller than the tolerance (the zero_eps of the policy by
+default) are zero, like in LinearSystem.
+
+Examples:
+    solver = OnlineSolver(3)
+    for equation in feed:
+        if solver.add(equation) == INCONSISTENT:
+            alert()
+        if solver.is_determined():
+            use(solver.solution())
+
+    solver.parametrization()     # basepoint and direction vectors
+
+"""
+
+
+INDEPENDENT = 'independent'
+REDUNDANT = 'redundant'
+INCONSISTENT = 'inconsistent'
+
+Parametrization = namedtuple('Parametrization', ['basepoint', 'direction_vectors', 'free_variables'])
+Parametrization.__doc__ = """The solutions of a consistent system.
+
+    Every solution is basepoint + sum(t_i * direction_vectors[i]) for any
+    numbers t_i.
+
+    Attributes:
+        basepoint(vector.Vector): The solution with every free variable zero.
+
+        direction_vectors(list[vector.Vector]): One per free variable.
+
+        free_variables(list[int]): The indexes of the variables that aren't
+            pivots.
+"""
+
+
+class OnlineSolver(object):
+
+    WRONG_DIMENSION_MSG = 'The equation must have {} coefficients'
+
+    def __init__(self, dimension, tolerance=None):
+        """Initialize the solver without equations.
+
+            Args:
+                dimension(int): The number of variables.
+
+                tolerance(Decimal): Coefficients with a smaller absolute value
+                                    are zero. Defaults to the zero_eps of the
+                                    policy in use when each equation is added.
+        """
+        self.dimension = dimension
+        self.tolerance = None if tolerance is None else Decimal(str(tolerance))
+        self.num_equations = 0
+        self.redundant = 0
+        self.conflicts = []
+        self._rows = []
+        self._pivots = []
+
+    def __len__(self):
+        """Returns the number of equations added."""
+        return self.num_equations
+
+    @property
+    def rank(self):
+        """int: The number of independent equations."""
+        return len(self._rows)
+
+    def is_consistent(self):
+        """Returns True if no equation contradicted the previous ones."""
+        return not self.conflicts
+
+    def is_determined(self):
+        """Returns True if the system is consistent and has an unique solution."""
+        return self.is_consistent() and self.rank == self.dimension
+
+    def _row_of(self, equation):
+        if isinstance(equation, Hyperplane):
+            coefficients, constant = equation.normal_vector.coordinates, equation.constant_term
+        else:
+            coefficients, constant = equation
+        if len(coefficients) != self.dimension:
+            raise ValueError(self.WRONG_DIMENSION_MSG.format(self.dimension))
+        return [Decimal(c) for c in coefficients] + [Decimal(constant)]
+
+    def _is_zero(self, value):
+        if self.tolerance is None:
+            return get_policy().is_near_zero(value)
+        return abs(value) < self.tolerance
+
+    @in_decimal_context
+    def add(self, equation):
+        """Adds an equation.
+
+            Args:
+                equation: A hyperplane.Hyperplane (line.Line, plane.Plane, ...)
+                          or a (coefficients, constant_term) pair.
+
+            Returns:
+                str: INDEPENDENT, REDUNDANT or INCONSISTENT.
+
+            Raises:
+                ValueError: If the equation doesn't have a coefficient per
+                            variable.
+        """
+        row = self._row_of(equation)
+        self.num_equations += 1
+
+        for basis_row, pivot in zip(self._rows, self._pivots):
+            coefficient = row[pivot]
+            if coefficient:
+                row = [a - coefficient * b for a, b in zip(row, basis_row)]
+                row[pivot] = Decimal(0)
+
+        pivot = max(range(self.dimension), key=lambda i: abs(row[i]), default=None)
+        if pivot is None or self._is_zero(row[pivot]):
+            if self._is_zero(row[self.dimension]):
+                self.redundant += 1
+                return REDUNDANT
+            self.conflicts.append(equation)
+            return INCONSISTENT
+
+        inverse = 1 / row[pivot]
+        row = [value * inverse for value in row]
+        row[pivot] = Decimal(1)
+        for i, basis_row in enumerate(self._rows):
+            coefficient = basis_row[pivot]
+            if coefficient:
+                basis_row = [a - coefficient * b for a, b in zip(basis_row, row)]
+                basis_row[pivot] = Decimal(0)
+                self._rows[i] = basis_row
+
+        position = bisect_left(self._pivots, pivot)
+        self._pivots.insert(position, pivot)
+        self._rows.insert(position, row)
+        return INDEPENDENT
+
+    def add_all(self, equations):
+        """Adds every equation of an iterable and returns their statuses."""
+        return [self.add(equation) for equation in equations]
+
+    def solution(self):
+        """Returns the current solution.
+
+            Unlike LinearSystem.solve, which returns False for some systems
+            with a free variable, the rank decides: every consistent system
+            with fewer independent equations than variables has many
+            solutions.
+
+            Returns:
+                list[Decimal]: If the system is consistent and its rank is the
+                    dimension.
+
+                bool: False if there is no solution and True if it is
+                    consistent and its rank is smaller than the dimension.
+        """
+        if not self.is_consistent():
+            return False
+        if not self.is_determined():
+            return True
+        return [row[self.dimension] for row in self._rows]
+
+    def parametrization(self):
+        """Returns all the current solutions as a point and directions.
+
+            Returns:
+                Parametrization: If the system is consistent.
+
+                None: If it has no solution.
+        """
+        if not self.is_consistent():
+            return None
+        pivots = set(self._pivots)
+        free_variables = [i for i in range(self.dimension) if i not in pivots]
+
+        basepoint = [Decimal(0)] * self.dimension
+        for row, pivot in zip(self._rows, self._pivots):
+            basepoint[pivot] = row[self.dimension]
+
+        direction_vectors = []
+        for free in free_variables:
+            direction = [Decimal(0)] * self.dimension
+            direction[free] = Decimal(1)
+            for row, pivot in zip(self._rows, self._pivots):
+                direction[pivot] = -row[free]
+            direction_vectors.append(Vector(direction))
+        return Parametrization(Vector(basepoint), direction_vectors, free_variables)
+
+    def to_linear_system(self):
+        """Returns the independent equations, in Reduced Row-Echelon Form, as a lin_sys.LinearSystem.
+
+            A LinearSystem needs an equation, so without independent ones
+            the system has the single equation 0 = 0.
+        """
+        from lin_sys import LinearSystem
+        rows = self._rows or [[Decimal(0)] * (self.dimension + 1)]
+        return LinearSystem([Hyperplane(Vector(row[:-1]), row[-1]) for row in rows])
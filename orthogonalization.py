@@ -0,0 +1,238 @@
+from collections import namedtuple
+from decimal import Decimal
+
+import numpy as np
+
+from vector import Vector
+from math_util import get_policy
+
+""""Orthogonalization documentation.
+
+Orthonormal bases of sets of vectors, computed on contiguous float arrays
+instead of with Vector.get_projection_orthogonal_to, which normalises the
+basis vector and allocates new Vectors on every call.
+
+The vectors are the rows of a C-contiguous array of shape (k, n), so every
+vector is contiguous in memory. Both methods return the orthonormal basis of
+the span of the vectors and R, such that
+
+    vectors[j] = sum(r[i][j] * basis[i] for i in range(rank))
+
+A vector that is a combination of the previous ones, up to the tolerance,
+doesn't add a basis vector: rank is the number of basis vectors and
+independent holds the indexes of the vectors that added one.
+
+modified_gram_schmidt orthogonalises every remaining vector against each new
+basis vector in one array operation. householder_qr applies the Householder
+reflections in blocks of block_size with the compact WY representation, so
+most of the work is done by matrix products, and it keeps orthogonality to
+machine precision even for badly conditioned sets.
+
+Examples:
+    qr = householder_qr([Vector(['1','1','0']), Vector(['2','2','0']), Vector(['0','1','1'])])
+    qr.rank           # 2
+    qr.independent    # array([0, 2])
+    qr.basis          # [Vector, Vector]
+
+    qr = modified_gram_schmidt(numpy_array)    # basis is a (rank, n) array
+
+"""
+
+
+QRResult = namedtuple('QRResult', ['basis', 'r', 'rank', 'independent'])
+QRResult.__doc__ = """An orthonormal basis of a set of vectors.
+
+    Attributes:
+        basis(list[vector.Vector]): The orthonormal basis, if the input was a
+            list of Vectors. Otherwise a numpy.ndarray of shape (rank, n).
+
+        r(numpy.ndarray): Shape (rank, k). The coordinates of every vector in
+            the basis. It is upper triangular on the independent vectors.
+
+        rank(int): The number of basis vectors.
+
+        independent(numpy.ndarray): The indexes of the vectors that added a
+            basis vector.
+"""
+
+
+def vectors_to_array(vectors):
+    """Returns the vectors as the rows of a contiguous float array.
+
+        Args:
+            vectors(list[vector.Vector]): The vectors. An array_like of shape
+                                          (k, n) is converted as is.
+
+        Returns:
+            numpy.ndarray: Shape (k, n), C-contiguous float64.
+    """
+    if len(vectors) and isinstance(vectors[0], Vector):
+        return np.array([[float(c) for c in v] for v in vectors], dtype=np.float64)
+    return np.ascontiguousarray(vectors, dtype=np.float64)
+
+
+def _tolerance(tolerance):
+    return get_policy().magnitude_eps if tolerance is None else float(tolerance)
+
+
+def _is_dependent(remaining_norm, original_norm, tolerance):
+    return original_norm == 0.0 or remaining_norm <= tolerance * original_norm
+
+
+def _result(vectors, basis, r, independent):
+    rank = len(independent)
+    if len(vectors) and isinstance(vectors[0], Vector):
+        basis = [Vector([Decimal(repr(value + 0.0)) for value in row]) for row in basis.tolist()]
+    return QRResult(basis, r[:rank], rank, np.array(independent, dtype=np.intp))
+
+
+def modified_gram_schmidt(vectors, tolerance=None):
+    """Orthonormalises vectors with the modified Gram-Schmidt process.
+
+        Args:
+            vectors(list[vector.Vector]): The vectors, or an array_like of
+                                          shape (k, n) with one per row.
+
+            tolerance(float): A vector is dependent on the previous ones when
+                              the norm of what is left of it after removing
+                              their directions is not bigger than tolerance
+                              times its norm. Defaults to the magnitude_eps
+                              of the tolerance policy.
+
+        Returns:
+            QRResult: The basis, R, the rank and the independent vectors.
+    """
+    work = vectors_to_array(vectors).copy()
+    tolerance = _tolerance(tolerance)
+    k, n = work.shape
+    original_norms = np.linalg.norm(work, axis=1)
+    basis = np.zeros((min(k, n), n))
+    r = np.zeros((min(k, n), k))
+    independent = []
+
+    for j in range(k):
+        p = len(independent)
+        remaining_norm = np.linalg.norm(work[j])
+        if p == n or _is_dependent(remaining_norm, original_norms[j], tolerance):
+            continue
+        basis[p] = work[j] / remaining_norm
+        r[p, j] = remaining_norm
+        if j + 1 < k:
+            coefficients = work[j + 1:] @ basis[p]
+            r[p, j + 1:] = coefficients
+            work[j + 1:] -= np.outer(coefficients, basis[p])
+        independent.append(j)
+
+    return _result(vectors, basis[:len(independent)], r, independent)
+
+
+def _triangular_factor(reflectors, taus):
+    # T of the compact WY form H_0 H_1 ... H_b-1 = I - Y T Y^T, Y = reflectors.T.
+    b = len(taus)
+    t = np.zeros((b, b))
+    products = reflectors @ reflectors.T
+    for i in range(b):
+        t[i, i] = taus[i]
+        if i:
+            t[:i, i] = -taus[i] * (t[:i, :i] @ products[:i, i])
+    return t
+
+
+def householder_qr(vectors, block_size=32, tolerance=None):
+    """Orthonormalises vectors with blocked Householder reflections.
+
+        Args:
+            vectors(list[vector.Vector]): The vectors, or an array_like of
+                                          shape (k, n) with one per row.
+
+            block_size(int): Number of reflections applied together to the
+                             remaining vectors.
+
+            tolerance(float): A vector is dependent on the previous ones when
+                              the norm of what is left of it after removing
+                              their directions is not bigger than tolerance
+                              times its norm. Defaults to the magnitude_eps
+                              of the tolerance policy.
+
+        Returns:
+            QRResult: The basis, R, the rank and the independent vectors.
+    """
+    work = vectors_to_array(vectors).copy()
+    tolerance = _tolerance(tolerance)
+    k, n = work.shape
+    original_norms = np.linalg.norm(work, axis=1)
+    reflectors = np.zeros((min(k, n), n))
+    taus = []
+    r = np.zeros((min(k, n), k))
+    independent = []
+    blocks = []
+
+    j = 0
+    while j < k and len(taus) < n:
+        first = len(taus)
+        # Left-looking inside the block: each vector gets the reflections of
+        # the block found before it, then may add its own.
+        while j < k and len(taus) - first < block_size and len(taus) < n:
+            p = len(taus)
+            w = work[j]
+            for q in range(first, p):
+                w -= taus[q] * (reflectors[q, q:] @ w[q:]) * reflectors[q]
+            remaining_norm = np.linalg.norm(w[p:])
+            r[:p, j] = w[:p]
+            if not _is_dependent(remaining_norm, original_norms[j], tolerance):
+                alpha = -remaining_norm if w[p] >= 0 else remaining_norm
+                u = w[p:].copy()
+                u[0] -= alpha
+                reflectors[p, p:] = u / np.linalg.norm(u)
+                taus.append(2.0)
+                r[p, j] = alpha
+                independent.append(j)
+            j += 1
+
+        if len(taus) > first:
+            block = reflectors[first:len(taus)]
+            t = _triangular_factor(block, taus[first:])
+            blocks.append((block, t))
+            # Right-looking for the rest: (I - Y T^T Y^T) on every remaining vector.
+            if j < k:
+                work[j:] -= ((work[j:] @ block.T) @ t) @ block
+
+    # Once the basis spans the whole space the remaining vectors are dependent.
+    for j in range(j, k):
+        r[:len(taus), j] = work[j, :len(taus)]
+
+    rank = len(taus)
+    basis = np.eye(rank, n)
+    for block, t in reversed(blocks):
+        basis -= ((basis @ block.T) @ t.T) @ block
+
+    # Make the diagonal of R positive, like the one of modified_gram_schmidt.
+    signs = np.where(r[np.arange(rank), independent] < 0, -1.0, 1.0)
+    basis *= signs[:, None]
+    r[:rank] *= signs[:, None]
+    return _result(vectors, basis, r, independent)
+
+
+def orthonormalize(vectors, method='householder', tolerance=None):
+    """Returns an orthonormal basis of the span of vectors.
+
+        Args:
+            vectors(list[vector.Vector]): The vectors, or an array_like of
+                                          shape (k, n) with one per row.
+
+            method(str): 'householder' or 'gram_schmidt'.
+
+            tolerance(float): See householder_qr.
+
+        Returns:
+            list[vector.Vector]: The basis. A numpy.ndarray of shape (rank, n)
+                                 if vectors is an array.
+
+        Raises:
+            ValueError: If the method is unknown.
+    """
+    if method == 'householder':
+        return householder_qr(vectors, tolerance=tolerance).basis
+    if method == 'gram_schmidt':
+        return modified_gram_schmidt(vectors, tolerance=tolerance).basis
+    raise ValueError('Unknown orthogonalization method {}'.format(method))
@@ -0,0 +1,313 @@
+from collections import namedtuple
+
+from math_util import get_policy
+
+""""Pivoting documentation.
+
+Gaussian elimination in floating point with a selectable pivoting strategy,
+for systems given as augmented rows [a_1, ..., a_n, k]. Each strategy picks
+the pivot of a step among the rows and columns that are still active:
+
+    first_nonzero   The first coefficient that isn't zero, scanning the
+                    column of the step, like LinearSystem.compute_triangular_form.
+    partial         The biggest coefficient of the column.
+    rook            A coefficient that is the biggest of both its row and its
+                    column, found by searching them alternately.
+    complete        The biggest coefficient left.
+
+Columns are swapped too when the column of the step is zero, or when rook or
+complete pivoting choose another column, and the solution is permuted back.
+With equilibrate=True the rows and then the columns are scaled so their
+biggest coefficient is 1 before eliminating.
+
+A coefficient is zero when its absolute value is not bigger than tolerance
+times the biggest coefficient of the (scaled) matrix. The result reports the
+growth factor: the biggest coefficient seen during the elimination divided by
+the biggest one at the start. Small growth factors mean the float solution
+can be trusted; big ones that more precision is needed.
+
+The solution follows the rules of LinearSystem.solve whatever the strategy:
+the rows are reduced to Reduced Row-Echelon Form when there are fewer pivots
+than variables, and a row with a single variable left means that variable is
+determined. Which variables are determined doesn't depend on the pivots
+chosen, so every strategy gives the same kind of result.
+
+New strategies are functions select(a, step, num_rows, num_cols, threshold)
+that return the (row, column) of the pivot, both not smaller than step, or
+None if every active coefficient is zero. They can be passed directly or
+registered by name with register_strategy.
+
+Examples:
+    result = eliminate(rows, pivoting='rook', equilibrate=True)
+    result.solution          # list of floats, False or True
+    result.growth_factor     # 1.0 <= growth_factor
+
+    system.solve_float(pivoting='complete')
+    system.eliminate_float('complete').growth_factor
+
+"""
+
+
+FIRST_NONZERO = 'first_nonzero'
+PARTIAL = 'partial'
+ROOK = 'rook'
+COMPLETE = 'complete'
+
+UNKNOWN_STRATEGY_MSG = 'Unknown pivoting strategy {}'
+
+EliminationResult = namedtuple('EliminationResult', ['solution', 'rank', 'growth_factor',
+                                                     'row_permutation', 'column_permutation'])
+EliminationResult.__doc__ = """The result of eliminate.
+
+    Attributes:
+        solution: A list of floats, False or True, following the rules of
+            LinearSystem.solve.
+
+        rank(int): The number of pivots.
+
+        growth_factor(float): The biggest coefficient seen during the
+            elimination divided by the biggest one at the start.
+
+        row_permutation(list[int]): The original row in each position.
+
+        column_permutation(list[int]): The variable in each column.
+"""
+
+
+def _first_active_column(a, step, num_rows, num_cols, threshold):
+    for col in range(step, num_cols):
+        for i in range(step, num_rows):
+            if abs(a[i][col]) > threshold:
+                return col
+    return None
+
+
+def select_first_nonzero(a, step, num_rows, num_cols, threshold):
+    """Returns the first nonzero coefficient of the first column that has one."""
+    col = _first_active_column(a, step, num_rows, num_cols, threshold)
+    if col is None:
+        return None
+    for i in range(step, num_rows):
+        if abs(a[i][col]) > threshold:
+            return i, col
+
+
+def select_partial(a, step, num_rows, num_cols, threshold):
+    """Returns the biggest coefficient of the first column that has a nonzero one."""
+    col = _first_active_column(a, step, num_rows, num_cols, threshold)
+    if col is None:
+        return None
+    row = max(range(step, num_rows), key=lambda i: abs(a[i][col]))
+    return row, col
+
+
+def select_rook(a, step, num_rows, num_cols, threshold):
+    """Returns a coefficient that is the biggest of its row and of its column."""
+    col = _first_active_column(a, step, num_rows, num_cols, threshold)
+    if col is None:
+        return None
+    row = max(range(step, num_rows), key=lambda i: abs(a[i][col]))
+    while True:
+        best_col = max(range(step, num_cols), key=lambda j: abs(a[row][j]))
+        if abs(a[row][best_col]) <= abs(a[row][col]):
+            return row, col
+        col = best_col
+        best_row = max(range(step, num_rows), key=lambda i: abs(a[i][col]))
+        if abs(a[best_row][col]) <= abs(a[row][col]):
+            return row, col
+        row = best_row
+
+
+def select_complete(a, step, num_rows, num_cols, threshold):
+    """Returns the biggest coefficient of the active rows and columns."""
+    best, position = threshold, None
+    for i in range(step, num_rows):
+        row = a[i]
+        for j in range(step, num_cols):
+            if abs(row[j]) > best:
+                best, position = abs(row[j]), (i, j)
+    return position
+
+
+_strategies = {FIRST_NONZERO: select_first_nonzero, PARTIAL: select_partial,
+               ROOK: select_rook, COMPLETE: select_complete}
+
+
+def register_strategy(name, select):
+    """Makes a pivoting strategy available by name.
+
+        Args:
+            name(str): The name to pass to eliminate.
+
+            select(callable): select(a, step, num_rows, num_cols, threshold)
+                              as described in the module documentation.
+    """
+    _strategies[name] = select
+
+
+def get_strategy(pivoting):
+    """Returns the select function of a strategy name. Callables are returned as they are.
+
+        Raises:
+            KeyError: If no strategy is registered with that name.
+    """
+    if callable(pivoting):
+        return pivoting
+    if pivoting not in _strategies:
+        raise KeyError(UNKNOWN_STRATEGY_MSG.format(pivoting))
+    return _strategies[pivoting]
+
+
+def equilibrate_rows(a, num_cols):
+    """Scales rows and then columns of a in place so their biggest coefficient is 1.
+
+        Args:
+            a(list[list[float]]): The augmented rows. The constant terms are
+                                  scaled with their row.
+
+            num_cols(int): Number of coefficients per row.
+
+        Returns:
+            list[float]: The column scales. Variable j of the scaled system
+                         is variable j of the original one divided by
+                         column_scale[j].
+    """
+    for row in a:
+        biggest = max((abs(value) for value in row[:num_cols]), default=0.0)
+        if biggest:
+            for j in range(num_cols + 1):
+                row[j] /= biggest
+    column_scale = []
+    for j in range(num_cols):
+        biggest = max((abs(row[j]) for row in a), default=0.0)
+        scale = 1.0 / biggest if biggest else 1.0
+        for row in a:
+            row[j] *= scale
+        column_scale.append(scale)
+    return column_scale
+
+
+def _unpermute(values, column_permutation, column_scale):
+    solution = [0.0] * len(values)
+    for position, variable in enumerate(column_permutation):
+        solution[variable] = values[position] * column_scale[variable]
+    return solution
+
+
+def _classify_underdetermined(a, rank, num_cols, tolerance):
+    # Reduces the pivot rows to Reduced Row-Echelon Form and applies the rules
+    # of LinearSystem.solve: a row with one variable determines it, a row with
+    # more leaves it free, and both kinds together give False.
+    for i in range(rank - 1, -1, -1):
+        row = a[i]
+        inverse = 1.0 / row[i]
+        for k in range(i, num_cols + 1):
+            row[k] *= inverse
+        for r in range(i):
+            target = a[r]
+            factor = target[i]
+            if factor:
+                for k in range(i, num_cols + 1):
+                    target[k] -= factor * row[k]
+
+    values = [0.0] * num_cols
+    one_variable_alone = False
+    single_solution = True
+    for i in range(rank):
+        row = a[i]
+        threshold = tolerance * max(abs(value) for value in row[:num_cols])
+        if any(abs(row[k]) > threshold for k in range(num_cols) if k != i):
+            single_solution = False
+        else:
+            one_variable_alone = True
+            values[i] = row[num_cols]
+
+    if not single_solution:
+        return not one_variable_alone
+    return values
+
+
+def eliminate(rows, pivoting=PARTIAL, equilibrate=False, tolerance=None):
+    """Solves the system of augmented rows with Gaussian elimination in floats.
+
+        Args:
+            rows(list[list]): One row per equation, the coefficients followed
+                              by the constant term. Values are converted to
+                              float.
+
+            pivoting: The name of a registered strategy or a select function.
+
+            equilibrate(bool): Scale rows and columns before eliminating.
+
+            tolerance(float): Coefficients not bigger than tolerance times the
+                              biggest coefficient are zero. Defaults to the
+                              magnitude_eps of the tolerance policy.
+
+        Returns:
+            EliminationResult: The solution, rank, growth factor and the
+                               permutations.
+
+        Raises:
+            KeyError: If pivoting is an unknown name.
+    """
+    select = get_strategy(pivoting)
+    tolerance = get_policy().magnitude_eps if tolerance is None else tolerance
+    a = [[float(value) for value in row] for row in rows]
+    num_rows = len(a)
+    num_cols = len(a[0]) - 1 if a else 0
+    column_scale = equilibrate_rows(a, num_cols) if equilibrate else [1.0] * num_cols
+
+    row_permutation = list(range(num_rows))
+    column_permutation = list(range(num_cols))
+    initial = max((abs(value) for row in a for value in row[:num_cols]), default=0.0)
+    threshold = tolerance * initial
+    biggest = initial
+
+    rank = 0
+    for step in range(min(num_rows, num_cols)):
+        position = select(a, step, num_rows, num_cols, threshold)
+        if position is None:
+            break
+        row, col = position
+        if row != step:
+            a[step], a[row] = a[row], a[step]
+            row_permutation[step], row_permutation[row] = row_permutation[row], row_permutation[step]
+        if col != step:
+            for r in a:
+                r[step], r[col] = r[col], r[step]
+            column_permutation[step], column_permutation[col] = column_permutation[col], column_permutation[step]
+
+        pivot_row = a[step]
+        pivot = pivot_row[step]
+        for i in range(step + 1, num_rows):
+            target = a[i]
+            factor = target[step] / pivot
+            if factor:
+                target[step] = 0.0
+                for k in range(step + 1, num_cols + 1):
+                    target[k] -= factor * pivot_row[k]
+                    if k < num_cols and abs(target[k]) > biggest:
+                        biggest = abs(target[k])
+        rank += 1
+
+    growth_factor = biggest / initial if initial else 1.0
+
+    # Rows without pivot have only zero coefficients left.
+    constant_threshold = max(threshold, tolerance * max((abs(row[num_cols]) for row in a), default=0.0))
+    if any(abs(a[i][num_cols]) > constant_threshold for i in range(rank, num_rows)):
+        solution = False
+    elif rank < num_cols:
+        solution = _classify_underdetermined(a, rank, num_cols, tolerance)
+        if isinstance(solution, list):
+            solution = _unpermute(solution, column_permutation, column_scale)
+    else:
+        values = [0.0] * num_cols
+        for i in range(rank - 1, -1, -1):
+            row = a[i]
+            total = row[num_cols]
+            for k in range(i + 1, num_cols):
+                total -= row[k] * values[k]
+            values[i] = total / row[i]
+        solution = _unpermute(values, column_permutation, column_scale)
+
+    return EliminationResult(solution, rank, growth_factor, row_permutation, column_permutation)
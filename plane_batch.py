@@ -0,0 +1,108 @@
+from collections import namedtuple
+
+import numpy as np
+
+from hyperplane_batch import hyperplanes_to_arrays
+
+""""Batch plane intersection documentation.
+
+Vectorized intersection lines of many pairs of planes. For the pair of planes
+n1 . x = k1 and n2 . x = k2 the direction of the intersection line is
+d = n1 x n2 and its point closest to the origin is
+
+    ((k1 (n2 . n2) - k2 (n1 . n2)) n1 + (k2 (n1 . n1) - k1 (n1 . n2)) n2) / |d|^2
+
+which is computed for all the pairs with array operations. Instead of raising
+or returning True like LinearSystem.solve, pairs without a line of
+intersection get a status code.
+
+Examples:
+    result = intersect_plane_pairs(planes_a, planes_b)
+
+    lines = result.status == INTERSECTING
+    points, directions = result.points[lines], result.directions[lines]
+
+"""
+
+
+INTERSECTING = 0
+PARALLEL = 1
+COINCIDENT = 2
+
+PlaneIntersections = namedtuple('PlaneIntersections', ['points', 'directions', 'status'])
+PlaneIntersections.__doc__ = """Intersection lines of pairs of planes.
+
+    Attributes:
+        points(numpy.ndarray): Shape (N, 3). The point of each line closest to
+            the origin. nan when status is not INTERSECTING.
+
+        directions(numpy.ndarray): Shape (N, 3). The unit direction of each
+            line. nan when status is not INTERSECTING.
+
+        status(numpy.ndarray): Shape (N,) of int8. INTERSECTING, PARALLEL or
+            COINCIDENT.
+"""
+
+
+def _unit_arrays(planes, tolerance):
+    # Normals not bigger than tolerance are zero, like Vector.is_zero, and
+    # keep their constant term unscaled.
+    if isinstance(planes, tuple):
+        normals, constants = (np.asarray(a, dtype=float) for a in planes)
+    else:
+        normals, constants = hyperplanes_to_arrays(planes)
+    norms = np.linalg.norm(normals, axis=1)
+    zero = norms <= tolerance
+    norms = np.where(zero, 1.0, norms)
+    normals = normals / norms[:, None]
+    normals[zero] = 0.0
+    return normals, constants / norms, zero
+
+
+def intersect_plane_pairs(planes_a, planes_b, tolerance=1e-10):
+    """Returns the intersection line of planes_a[i] and planes_b[i] for every i.
+
+        Args:
+            planes_a(list[plane.Plane]): The first plane of every pair, or a
+                (normals, constants) tuple of shapes (N, 3) and (N,).
+
+            planes_b(list[plane.Plane]): The second plane of every pair, in the
+                same format.
+
+            tolerance(float): Pairs whose unit normals have a cross product not
+                              bigger than this are parallel, and parallel pairs
+                              whose offsets differ by no more than this are
+                              coincident. Normals not bigger than this are
+                              zero: such an equation is parallel to every
+                              plane and only coincident with another zero
+                              normal equation with the same constant term.
+
+        Returns:
+            PlaneIntersections: The lines and the status of every pair.
+    """
+    n1, k1, zero1 = _unit_arrays(planes_a, tolerance)
+    n2, k2, zero2 = _unit_arrays(planes_b, tolerance)
+
+    directions = np.cross(n1, n2)
+    squared_module = np.einsum('ij,ij->i', directions, directions)
+    parallel = np.sqrt(squared_module) <= tolerance
+
+    cosine = np.einsum('ij,ij->i', n1, n2)
+    orientation = np.where(cosine < 0, -1.0, 1.0)
+    coincident = parallel & (np.abs(k1 - orientation * k2) <= tolerance)
+    # Like Hyperplane.is_same_as: two zero normals are the same equation only
+    # with the same constant term and a zero normal is never the same as a plane.
+    coincident = np.where(zero1 | zero2, zero1 & zero2 & (np.abs(k1 - k2) <= tolerance), coincident)
+
+    status = np.full(len(n1), INTERSECTING, dtype=np.int8)
+    status[parallel] = PARALLEL
+    status[coincident] = COINCIDENT
+
+    safe_module = np.where(parallel, 1.0, squared_module)
+    # The normals are unit vectors, so n1 . n1 = n2 . n2 = 1.
+    points = ((k1 - k2 * cosine)[:, None] * n1 + (k2 - k1 * cosine)[:, None] * n2) / safe_module[:, None]
+    directions = directions / np.sqrt(safe_module)[:, None]
+    points[parallel] = np.nan
+    directions[parallel] = np.nan
+
+    return PlaneIntersections(points, directions, status)
@@ -0,0 +1,222 @@
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+
+from math_util import get_policy
+from kernels import get_kernels, interpret_rref
+
+""""Shared memory batch solve documentation.
+
+Solves big batches of lin_sys.LinearSystem in a pool of processes without
+pickling planes, vectors or Decimals. The coefficients of every system are
+written once, as doubles, into a multiprocessing.shared_memory block, next to
+an int block that holds where each system starts, its size and where its
+solution goes. The workers get only ranges of system indexes: they read the
+coefficients from the shared block, solve with the kernels of the kernels
+module and write the solutions back into it.
+
+The pool and the kernels loaded by each worker are kept between batches, so
+only the first batch pays for starting the processes and compiling the
+kernels. Solutions are floats and follow the rules of
+LinearSystem.solve_float.
+
+Examples:
+    with SharedMemorySolver(processes=4) as solver:
+        solutions = solver.solve(systems)
+
+    solutions = solve_batch_shared(systems)
+
+"""
+
+
+UNIQUE = 0
+NO_SOLUTION = 1
+INFINITE = 2
+
+# Ints per system in the layout block: coefficients offset, number of
+# equations, dimension, solution offset and the status written by the worker.
+LAYOUT_WIDTH = 5
+
+_worker_kernels = None
+_worker_segments = {}
+
+
+def _init_worker(kernels_name):
+    global _worker_kernels
+    _worker_kernels = get_kernels(kernels_name)
+    # Compile, if the kernels are compiled, before the first real task.
+    _worker_kernels.rref(_worker_kernels.as_matrix([[1.0, 1.0]]), _worker_kernels.as_pivots(1), 1e-10)
+
+
+def _attach(floats_name, ints_name):
+    key = (floats_name, ints_name)
+    if key not in _worker_segments:
+        _detach_all()
+        floats_block = shared_memory.SharedMemory(name=floats_name)
+        ints_block = shared_memory.SharedMemory(name=ints_name)
+        _worker_segments[key] = (floats_block, ints_block,
+                                 floats_block.buf.cast('d'), ints_block.buf.cast('q'))
+    return _worker_segments[key][2:]
+
+
+def _detach_all():
+    for floats_block, ints_block, floats, ints in _worker_segments.values():
+        floats.release()
+        ints.release()
+        floats_block.close()
+        ints_block.close()
+    _worker_segments.clear()
+
+
+def _solve_range(task):
+    floats_name, ints_name, start, stop, eps = task
+    floats, ints = _attach(floats_name, ints_name)
+    kernels = _worker_kernels
+
+    for i in range(start, stop):
+        base = i * LAYOUT_WIDTH
+        offset, equations, dimension, solution_offset = ints[base:base + 4]
+        width = dimension + 1
+        a = kernels.as_matrix([floats[offset + r * width:offset + (r + 1) * width]
+                               for r in range(equations)])
+        pivots = kernels.as_pivots(equations)
+        kernels.rref(a, pivots, eps)
+        solution = interpret_rref(a, pivots, dimension, eps)
+
+        if solution is False:
+            ints[base + 4] = NO_SOLUTION
+        elif solution is True:
+            ints[base + 4] = INFINITE
+        else:
+            ints[base + 4] = UNIQUE
+            for k, value in enumerate(solution):
+                floats[solution_offset + k] = value
+    return stop - start
+
+
+def _create_block(values, typecode):
+    values = array(typecode, values)
+    block = shared_memory.SharedMemory(create=True, size=max(len(values) * values.itemsize, 1))
+    block.buf[:len(values) * values.itemsize] = values.tobytes()
+    return block
+
+
+class SharedMemorySolver(object):
+
+    def __init__(self, processes=None, chunk_size=None, kernels=None):
+        """Initialize the solver. The pool is started by the first solve.
+
+            Args:
+                processes(int): Number of worker processes. Defaults to the
+                                number of cores.
+
+                chunk_size(int): Number of systems per task. By default every
+                                 worker gets about four tasks per batch.
+
+                kernels(str): 'numba' or 'python'. Defaults to the kernels
+                              returned by kernels.get_kernels().
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.kernels = kernels or get_kernels().name
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stops the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                              initargs=(self.kernels,))
+        return self._pool
+
+    def solve(self, systems):
+        """Solves a batch of systems in the worker processes.
+
+            Args:
+                systems(list[lin_sys.LinearSystem]): The systems to solve.
+
+            Returns:
+                list: For each system, in order, a list of floats if it has an
+                      unique solution, False if it has none and True if it has
+                      many.
+        """
+        if not systems:
+            return []
+
+        coefficients, layout = [], []
+        solutions_size = 0
+        for system in systems:
+            dimension = system.dimension
+            layout += [len(coefficients), len(system), dimension, 0, UNIQUE]
+            for p in system.planes:
+                coefficients.extend(float(c) for c in p.normal_vector)
+                coefficients.append(float(p.constant_term))
+            solutions_size += dimension
+        solution_offset = len(coefficients)
+        for i, system in enumerate(systems):
+            layout[i * LAYOUT_WIDTH + 3] = solution_offset
+            solution_offset += system.dimension
+        coefficients.extend([0.0] * solutions_size)
+
+        floats_block = _create_block(coefficients, 'd')
+        ints_block = _create_block(layout, 'q')
+        try:
+            chunk_size = self.chunk_size or max(1, -(-len(systems) // (self.processes * 4)))
+            eps = get_policy().zero_eps
+            tasks = [(floats_block.name, ints_block.name, start, min(start + chunk_size, len(systems)), eps)
+                     for start in range(0, len(systems), chunk_size)]
+            for _ in self._get_pool().imap_unordered(_solve_range, tasks):
+                pass
+
+            floats = floats_block.buf.cast('d')
+            ints = ints_block.buf.cast('q')
+            try:
+                results = []
+                for i, system in enumerate(systems):
+                    base = i * LAYOUT_WIDTH
+                    status = ints[base + 4]
+                    if status == NO_SOLUTION:
+                        results.append(False)
+                    elif status == INFINITE:
+                        results.append(True)
+                    else:
+                        start = ints[base + 3]
+                        results.append(floats[start:start + system.dimension].tolist())
+            finally:
+                floats.release()
+                ints.release()
+        finally:
+            floats_block.close()
+            floats_block.unlink()
+            ints_block.close()
+            ints_block.unlink()
+        return results
+
+
+def solve_batch_shared(systems, processes=None, chunk_size=None):
+    """Solves a batch of systems in a pool of processes that is closed afterwards.
+
+        Args:
+            systems(list[lin_sys.LinearSystem]): The systems to solve.
+
+            processes(int): Number of worker processes.
+
+            chunk_size(int): Number of systems per task.
+
+        Returns:
+            list: The solutions, as returned by SharedMemorySolver.solve.
+    """
+    with SharedMemorySolver(processes, chunk_size) as solver:
+        return solver.solve(systems)
@@ -0,0 +1,176 @@
+import sys
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+from math_util import get_policy, get_precision
+
+""""SolveCache class documentation.
+
+A bounded LRU cache for the results of lin_sys.LinearSystem.solve. Systems
+are keyed by a canonical form that doesn't change when the equations are
+reordered or scaled: every equation (coefficients and constant term) is
+divided by its first nonzero value, quantised to a multiple of "quantum" and
+the equations are sorted. Systems whose canonical forms are equal have the
+same solution, so the cached one is returned without running the elimination.
+
+Examples:
+    cache = SolveCache(max_bytes=1 << 20)
+
+    solution = lin_sys.LinearSystem([p1,p2,p3]).solve(cache=cache)
+
+    # Same system with the equations swapped and scaled: answered by the cache.
+    solution = lin_sys.LinearSystem([p2 * 2,p1,p3]).solve(cache=cache)
+
+
+Attributes:
+    max_bytes(int): The maximum estimated size of the cached keys and results.
+
+    quantum(Decimal): The resolution of the quantisation of the canonical form.
+        Values that differ by less than it can share a key.
+
+    tolerance(Decimal): Values whose absolute value is not bigger than this
+        are considered zero when looking for the first nonzero value of an
+        equation.
+
+    hits(int): Number of lookups answered from the cache.
+
+    misses(int): Number of lookups that had to solve the system.
+
+    evictions(int): Number of results dropped to respect max_bytes.
+
+    current_bytes(int): The estimated size of the cached keys and results.
+
+"""
+
+
+class SolveCache(object):
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, quantum='1e-12', tolerance='1e-10'):
+        """Initialize an empty cache.
+
+            Args:
+                max_bytes(int): The maximum estimated size of the cache.
+
+                quantum(Decimal): The resolution of the quantisation of the
+                                  canonical form.
+
+                tolerance(Decimal): Values not bigger than this are considered
+                                    zero.
+        """
+        self.max_bytes = max_bytes
+        self.quantum = Decimal(quantum)
+        self.tolerance = Decimal(tolerance)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Returns the number of cached results."""
+        return len(self._entries)
+
+    def canonical_key(self, system):
+        """Returns the canonical form of system.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to canonicalise.
+
+            Returns:
+                tuple: The dimension, the precision and zero tolerance in use,
+                       which change the solution, and the sorted quantised
+                       equations, each a tuple of ints.
+        """
+        rows = []
+        for p in system.planes:
+            row = list(p.normal_vector) + [p.constant_term]
+            first_nonzero = next((value for value in row if abs(value) > self.tolerance), None)
+            if first_nonzero is None:
+                rows.append((0,) * len(row))
+                continue
+            rows.append(tuple(int((value / first_nonzero / self.quantum).to_integral_value())
+                              for value in row))
+        rows.sort()
+        return (system.dimension, get_precision(), get_policy().zero_eps) + tuple(rows)
+
+    def get_or_compute(self, system, compute):
+        """Returns the cached result for system or computes and caches it.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to look up.
+
+                compute(callable): Called without arguments on a miss. Returns
+                                   the result to cache.
+
+            Returns:
+                The cached or computed result. Lists are copied so callers can't
+                modify the cached value.
+        """
+        key = self.canonical_key(system)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(self._entries[key][0])
+            self.misses += 1
+
+        result = compute()
+        self.put(key, result)
+        return self._copy(result)
+
+    def put(self, key, result):
+        """Caches result under key, evicting the least recently used entries.
+
+            Results bigger than max_bytes are not cached.
+
+            Args:
+                key(tuple): A key returned by canonical_key.
+
+                result: The result to cache.
+        """
+        size = self._estimate_size(key) + self._estimate_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (self._copy(result), size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result. Statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Returns the statistics of this cache.
+
+            Returns:
+                dict: hits, misses, evictions, entries and current_bytes.
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries),
+                    'current_bytes': self.current_bytes}
+
+    @staticmethod
+    def _copy(result):
+        if isinstance(result, list):
+            return list(result)
+        return result
+
+    @staticmethod
+    def _estimate_size(value):
+        size = sys.getsizeof(value)
+        if isinstance(value, (tuple, list)):
+            size += sum(SolveCache._estimate_size(item) for item in value)
+        return size
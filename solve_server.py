@@ -0,0 +1,470 @@
+import asyncio
+import json
+from decimal import Decimal
+
+from vector import Vector
+from hyperplane import Hyperplane
+from lin_sys import LinearSystem
+
+""""Solve server documentation.
+
+A small asyncio server that solves lin_sys.LinearSystem instances for other
+processes, so that they don't need to import and warm up the solver
+themselves. Requests that arrive within the same latency window are coalesced
+and solved together in one executor call. The number of pending requests is
+bounded: when the queue is full the server stops reading from the
+connections until the solver catches up.
+
+By default every system of a batch is solved with LinearSystem.solve, in
+Decimal and one after the other, so the answers are exact but a batch holds
+the GIL. With a batch_solver, such as process_batch.SharedMemorySolver, each
+batch is handed to it in one call and solved in floats by its kernels, in
+other processes.
+
+The protocol is one JSON object per line. A request is
+{"id": 1, "planes": [["1", "2", "3", "4"], ...]} where every row holds the
+coefficients of an equation followed by its constant term. A response is
+{"id": 1, "solution": ["1", "2", "3"]}, {"id": 1, "solution": true} or
+{"id": 1, "error": "message"}, using the same values as LinearSystem.solve.
+Lines longer than max_line_size get an error response and the connection is
+closed, since the rest of the line can't be told apart from the next request.
+
+Examples:
+    Serving on a unix socket and solving from another process:
+
+    server = SolveServer(path='/tmp/lin_sys.sock')
+    await server.start()
+
+    client = SolveClient(path='/tmp/lin_sys.sock')
+    await client.connect()
+    solution = await client.solve(lin_sys.LinearSystem([p1,p2,p3]))
+
+    Solving the batches in 4 worker processes:
+
+    server = SolveServer(path='/tmp/lin_sys.sock',
+                         batch_solver=process_batch.SharedMemorySolver(processes=4))
+
+"""
+
+
+MAX_LINE_SIZE = 16 * 1024 * 1024
+
+
+def system_to_rows(system):
+    """Returns the rows of a system as lists of strings.
+
+        Args:
+            system(lin_sys.LinearSystem): The system to serialise.
+
+        Returns:
+            list[list[str]]: One row per equation with the coefficients followed
+                             by the constant term.
+    """
+    return [[str(c) for c in p.normal_vector] + [str(p.constant_term)]
+            for p in system.planes]
+
+
+def rows_to_system(rows):
+    """Returns a system built from rows produced by system_to_rows.
+
+        Args:
+            rows(list[list[str]]): One row per equation with the coefficients
+                                   followed by the constant term.
+
+        Returns:
+            lin_sys.LinearSystem: The system.
+    """
+    return LinearSystem([Hyperplane(Vector(list(row[:-1])), row[-1]) for row in rows])
+
+
+def solve_batch(systems):
+    """Solves a batch of systems in order.
+
+        Args:
+            systems(list[lin_sys.LinearSystem]): The systems to solve.
+
+        Returns:
+            list[tuple]: For each system a ('solution', value) or ('error', message)
+                         tuple.
+    """
+    results = []
+    for system in systems:
+        try:
+            results.append(('solution', system.solve()))
+        except Exception as e:
+            results.append(('error', str(e)))
+    return results
+
+
+def _retrieve_exception(task):
+    if not task.cancelled():
+        task.exception()
+
+
+def _encode_solution(solution):
+    if isinstance(solution, bool):
+        return solution
+    return [str(value) for value in solution]
+
+
+def _decode_solution(solution):
+    if isinstance(solution, bool):
+        return solution
+    return [Decimal(value) for value in solution]
+
+
+class SolveServer(object):
+
+    SERVER_NOT_STARTED_MSG = 'The server has not been started'
+    SERVER_CLOSED_MSG = 'The server was closed'
+    INVALID_REQUEST_MSG = 'Invalid request'
+    REQUEST_TOO_LONG_MSG = 'Request longer than {} bytes'
+
+    def __init__(self, host='127.0.0.1', port=0, path=None, batch_window=0.002,
+                 max_batch_size=64, max_pending=1024, executor=None, batch_solver=None,
+                 max_line_size=MAX_LINE_SIZE):
+        """Initialize the server. It doesn't listen until start is called.
+
+            Args:
+                host(str): The address to listen on when path is not provided.
+
+                port(int): The port to listen on. Zero picks a free port.
+
+                path(str): The path of a unix socket to listen on instead of
+                           host and port.
+
+                batch_window(float): Seconds to wait for more requests before
+                                     solving a batch.
+
+                max_batch_size(int): The maximum number of systems solved in
+                                     one batch.
+
+                max_pending(int): The maximum number of requests waiting to be
+                                  solved before the server stops reading.
+
+                executor(concurrent.futures.Executor): Where batches are solved.
+                                                       Defaults to the loop's
+                                                       default executor.
+
+                batch_solver: An object whose solve(systems) returns the
+                              solution of every system, like
+                              process_batch.SharedMemorySolver. If provided,
+                              each batch is solved with one call to it. The
+                              server doesn't close it.
+
+                max_line_size(int): The longest request line, in bytes.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.executor = executor
+        self.batch_solver = batch_solver
+        self.max_line_size = max_line_size
+        self._server = None
+        self._queue = None
+        self._batcher = None
+        self._closing = False
+        self._handlers = set()
+        self._writers = set()
+
+    @property
+    def address(self):
+        """The path or (host, port) the server is listening on."""
+        if self._server is None:
+            raise Exception(self.SERVER_NOT_STARTED_MSG)
+        if self.path is not None:
+            return self.path
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """Start listening and batching requests."""
+        self._closing = False
+        self._queue = asyncio.Queue(self.max_pending)
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection,
+                                                           path=self.path,
+                                                           limit=self.max_line_size)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection,
+                                                      self.host, self.port,
+                                                      limit=self.max_line_size)
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening, close the open connections and cancel the batching task.
+
+            Requests that were queued or being solved fail with
+            SERVER_CLOSED_MSG.
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                self._fail(future)
+
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def solve(self, system):
+        """Queue a system to be solved in the next batch and wait for its solution.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to solve.
+
+            Returns:
+                The value returned by LinearSystem.solve.
+
+            Raises:
+                Exception: If solving the system raised.
+        """
+        kind, value = await (await self._enqueue(system))
+        if kind == 'error':
+            raise Exception(value)
+        return value
+
+    async def _enqueue(self, system):
+        if self._queue is None:
+            raise Exception(self.SERVER_NOT_STARTED_MSG)
+        if self._closing:
+            raise Exception(self.SERVER_CLOSED_MSG)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((system, future))
+        return future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            systems = [system for system, _ in batch]
+            try:
+                if self.batch_solver is None:
+                    results = await loop.run_in_executor(self.executor, solve_batch, systems)
+                else:
+                    solutions = await loop.run_in_executor(self.executor, self.batch_solver.solve, systems)
+                    results = [('solution', solution) for solution in solutions]
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    self._fail(future)
+                raise
+            except Exception as e:
+                results = [('error', str(e))] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _fail(self, future):
+        if not future.done():
+            future.set_exception(Exception(self.SERVER_CLOSED_MSG))
+
+    async def _handle_connection(self, reader, writer):
+        if self._closing:
+            writer.close()
+            return
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        self._writers.add(writer)
+        lock = asyncio.Lock()
+        replies = []
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line went over the limit of the stream.
+                    await self._write(writer, lock, {'id': None, 'error':
+                                                     self.REQUEST_TOO_LONG_MSG.format(self.max_line_size)})
+                    break
+                if not line:
+                    break
+
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request['id']
+                    system = rows_to_system(request['planes'])
+                except Exception:
+                    await self._write(writer, lock, {'id': request_id,
+                                                     'error': self.INVALID_REQUEST_MSG})
+                    continue
+
+                # Waiting for room in the queue stops reading from this
+                # connection, which is how backpressure reaches the clients.
+                future = await self._enqueue(system)
+                reply = asyncio.ensure_future(self._reply(request_id, future, writer, lock))
+                # A reply fails if the client went away; that only ends the
+                # reply, but its exception is retrieved so it isn't logged.
+                reply.add_done_callback(_retrieve_exception)
+                replies.append(reply)
+                replies = [reply for reply in replies if not reply.done()]
+
+            if replies:
+                await asyncio.gather(*replies, return_exceptions=True)
+        except asyncio.CancelledError:
+            # close cancels the handlers. Ending normally keeps asyncio.streams
+            # from logging the cancellation as an error.
+            if not self._closing:
+                raise
+        finally:
+            for reply in replies:
+                reply.cancel()
+            writer.close()
+            self._writers.discard(writer)
+            self._handlers.discard(handler)
+
+    async def _reply(self, request_id, future, writer, lock):
+        kind, value = await future
+        if kind == 'error':
+            response = {'id': request_id, 'error': value}
+        else:
+            response = {'id': request_id, 'solution': _encode_solution(value)}
+        await self._write(writer, lock, response)
+
+    @staticmethod
+    async def _write(writer, lock, response):
+        async with lock:
+            writer.write((json.dumps(response) + '\n').encode())
+            await writer.drain()
+
+
+class SolveClient(object):
+
+    CLIENT_NOT_CONNECTED_MSG = 'The client is not connected'
+    CONNECTION_CLOSED_MSG = 'The connection to the server was closed'
+
+    def __init__(self, host='127.0.0.1', port=None, path=None, max_line_size=MAX_LINE_SIZE):
+        """Initialize the client. It doesn't connect until connect is called.
+
+            Args:
+                host(str): The address of the server when path is not provided.
+
+                port(int): The port of the server.
+
+                path(str): The path of the unix socket of the server.
+
+                max_line_size(int): The longest response line, in bytes.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_line_size = max_line_size
+        self._reader = None
+        self._writer = None
+        self._listener = None
+        self._pending = {}
+        self._next_id = 0
+
+    async def connect(self):
+        """Open the connection to the server."""
+        if self.path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path,
+                                                                            limit=self.max_line_size)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port,
+                                                                       limit=self.max_line_size)
+        self._listener = asyncio.ensure_future(self._listen())
+
+    async def close(self):
+        """Close the connection. Pending requests fail."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._fail_pending()
+
+    async def solve(self, system):
+        """Send a system to the server and wait for its solution.
+
+            Many calls can be awaited concurrently on the same client, the
+            server batches them together.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to solve.
+
+            Returns:
+                list[Decimal]: The unique solution of the system.
+
+                bool: False if there is no solution and True if there are many
+                      solutions.
+
+            Raises:
+                Exception: If the server could not solve the system or the
+                           connection was closed.
+        """
+        if self._writer is None:
+            raise Exception(self.CLIENT_NOT_CONNECTED_MSG)
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        request = {'id': request_id, 'planes': system_to_rows(system)}
+        self._writer.write((json.dumps(request) + '\n').encode())
+        await self._writer.drain()
+
+        response = await future
+        if 'error' in response:
+            raise Exception(response['error'])
+        return _decode_solution(response['solution'])
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response['id'], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(Exception(self.CONNECTION_CLOSED_MSG))
+        self._pending = {}
@@ -0,0 +1,296 @@
+import math
+from bisect import bisect_left
+from decimal import Decimal
+
+import math_util
+from vector import Vector
+
+""""SparseVector class documentation.
+
+A vector of many dimensions with few nonzero coordinates. Only the indexes
+of the nonzero coordinates, sorted, and their values, as Decimals, are
+stored, so dot products, modules, additions, scaling, projections and angles
+cost time proportional to the number of nonzeros instead of the dimension.
+
+It works together with vector.Vector: a SparseVector can be added to, dotted
+with and projected on a Vector, and converted to and from one. Sparse with
+sparse operations give SparseVectors; operations that mix in a Vector give
+a Vector when the result is dense (addition) and a SparseVector when it keeps
+the sparsity of self (scaling, projections on self).
+
+Examples:
+    v = SparseVector({3: '1.5', 40000: '-2'}, dimension=50000)
+    w = SparseVector.from_dense(Vector(['0', '1', '0', '2']))
+
+    v.dot(v)          # Decimal('6.25')
+    v.nnz             # 2
+    v.to_dense()      # vector.Vector with 50000 coordinates
+
+Attributes:
+    indexes(tuple[int]): The sorted indexes of the nonzero coordinates.
+
+    values(tuple[Decimal]): The value of each of them.
+
+    dimension(int): The number of coordinates.
+
+"""
+
+
+class SparseVector(object):
+
+    DIFFERENT_DIMENSIONS_MSG = 'Vectors should have same length'
+    INDEX_OUT_OF_RANGE_MSG = 'The index {} is not a coordinate of a vector of dimension {}'
+
+    __slots__ = ('indexes', 'values', 'dimension')
+
+    def __init__(self, coordinates, dimension):
+        """Initialize the vector.
+
+            Args:
+                coordinates(dict): The value of every nonzero coordinate by
+                                   index. A list of (index, value) pairs is
+                                   also accepted. Values are converted to
+                                   Decimal and zeros are dropped.
+
+                dimension(int): The number of coordinates.
+
+            Raises:
+                IndexError: If an index is not between 0 and dimension - 1.
+        """
+        items = coordinates.items() if isinstance(coordinates, dict) else coordinates
+        pairs = {}
+        for index, value in items:
+            if not 0 <= index < dimension:
+                raise IndexError(self.INDEX_OUT_OF_RANGE_MSG.format(index, dimension))
+            value = Decimal(value)
+            if value:
+                pairs[index] = value
+            else:
+                pairs.pop(index, None)
+        ordered = sorted(pairs)
+        self._set(tuple(ordered), tuple(pairs[i] for i in ordered), dimension)
+
+    def _set(self, indexes, values, dimension):
+        self.indexes = indexes
+        self.values = values
+        self.dimension = dimension
+
+    @classmethod
+    def _from_sorted(cls, indexes, values, dimension):
+        vector = cls.__new__(cls)
+        vector._set(tuple(indexes), tuple(values), dimension)
+        return vector
+
+    @classmethod
+    def from_dense(cls, vector):
+        """Returns the sparse version of a vector.Vector."""
+        pairs = [(i, value) for i, value in enumerate(vector.coordinates) if value]
+        return cls._from_sorted([i for i, _ in pairs], [value for _, value in pairs], vector.dimension)
+
+    def to_dense(self):
+        """Returns the vector.Vector with the same coordinates."""
+        coordinates = [Decimal(0)] * self.dimension
+        for index, value in zip(self.indexes, self.values):
+            coordinates[index] = value
+        return Vector(coordinates)
+
+    @property
+    def nnz(self):
+        """int: The number of nonzero coordinates."""
+        return len(self.indexes)
+
+    def items(self):
+        """Returns an iterator of the (index, value) of the nonzero coordinates."""
+        return zip(self.indexes, self.values)
+
+    def __getitem__(self, key):
+        """Returns the coordinate at index key, zero if it isn't stored.
+
+            Raises:
+                IndexError: If key is not a coordinate.
+        """
+        if not 0 <= key < self.dimension:
+            raise IndexError(self.INDEX_OUT_OF_RANGE_MSG.format(key, self.dimension))
+        position = bisect_left(self.indexes, key)
+        if position < len(self.indexes) and self.indexes[position] == key:
+            return self.values[position]
+        return Decimal(0)
+
+    def __len__(self):
+        return self.dimension
+
+    def __str__(self):
+        return 'SparseVector({}): {}'.format(self.dimension, dict(self.items()))
+
+    def __eq__(self, v):
+        """Returns True if v has the same coordinates. v can be a Vector."""
+        if isinstance(v, Vector):
+            return self.dimension == v.dimension and self == SparseVector.from_dense(v)
+        return (isinstance(v, SparseVector) and self.dimension == v.dimension
+                and self.indexes == v.indexes and self.values == v.values)
+
+    def _check_dimension(self, v):
+        if self.dimension != v.dimension:
+            raise ValueError(self.DIFFERENT_DIMENSIONS_MSG)
+
+    def _merge(self, v, coefficient):
+        # self + coefficient * v over the union of the nonzeros, in one pass.
+        indexes, values = [], []
+        a, b = 0, 0
+        na, nb = len(self.indexes), len(v.indexes)
+        while a < na or b < nb:
+            if b == nb or (a < na and self.indexes[a] < v.indexes[b]):
+                index, value = self.indexes[a], self.values[a]
+                a += 1
+            elif a == na or v.indexes[b] < self.indexes[a]:
+                index, value = v.indexes[b], coefficient * v.values[b]
+                b += 1
+            else:
+                index, value = self.indexes[a], self.values[a] + coefficient * v.values[b]
+                a += 1
+                b += 1
+            if value:
+                indexes.append(index)
+                values.append(value)
+        return SparseVector._from_sorted(indexes, values, self.dimension)
+
+    def _dense_sum(self, v, sign):
+        coordinates = [sign * value for value in v.coordinates]
+        for index, value in zip(self.indexes, self.values):
+            coordinates[index] += value
+        return Vector(coordinates)
+
+    def __add__(self, v):
+        """Returns self + v.
+
+            Args:
+                v: A SparseVector, or a vector.Vector.
+
+            Returns:
+                SparseVector: If v is sparse.
+
+                vector.Vector: If v is a Vector.
+        """
+        self._check_dimension(v)
+        if isinstance(v, Vector):
+            return self._dense_sum(v, 1)
+        return self._merge(v, 1)
+
+    __radd__ = __add__
+
+    def __sub__(self, v):
+        """Returns self - v, sparse if v is sparse and a vector.Vector otherwise."""
+        self._check_dimension(v)
+        if isinstance(v, Vector):
+            return self._dense_sum(v, -1)
+        return self._merge(v, -1)
+
+    def __rsub__(self, v):
+        return (self * -1) + v
+
+    def __mul__(self, number):
+        """Returns the vector multiplied by a number."""
+        if not isinstance(number, Decimal):
+            number = Decimal(number) if isinstance(number, int) else Decimal(repr(number))
+        if not number:
+            return SparseVector._from_sorted((), (), self.dimension)
+        return SparseVector._from_sorted(self.indexes, [value * number for value in self.values], self.dimension)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return self * -1
+
+    def dot(self, v):
+        """Returns the dot product with v.
+
+            Args:
+                v: A SparseVector or a vector.Vector.
+
+            Returns:
+                Decimal: The dot product.
+
+            Raises:
+                ValueError: If the vectors don't have the same dimension.
+        """
+        self._check_dimension(v)
+        if isinstance(v, Vector):
+            coordinates = v.coordinates
+            return sum((value * coordinates[index] for index, value in self.items()), Decimal(0))
+        if v.nnz < self.nnz:
+            return v.dot(self)
+        result = Decimal(0)
+        position = 0
+        for index, value in self.items():
+            # Galloping through the bigger vector keeps the cost near min(nnz) log(max(nnz)).
+            position = bisect_left(v.indexes, index, position)
+            if position == len(v.indexes):
+                break
+            if v.indexes[position] == index:
+                result += value * v.values[position]
+        return result
+
+    def module(self):
+        """Returns the module of this vector as a float."""
+        return math.sqrt(sum(value * value for value in self.values))
+
+    def is_zero(self, tolerance=None):
+        """Returns True if the module is zero, up to tolerance."""
+        return math_util.get_policy().is_zero_magnitude(self.module(), tolerance)
+
+    def get_unit_vector(self):
+        """Returns the unit vector in the direction of this one.
+
+            Raises:
+                ZeroDivisionError: If this is the zero vector.
+        """
+        return self * (1 / self.dot(self).sqrt())
+
+    def get_projection_on(self, v):
+        """Returns the projection of this vector on v.
+
+            Args:
+                v: A SparseVector or a vector.Vector.
+
+            Returns:
+                SparseVector: If v is sparse. The projection is a multiple of
+                              v, so it has its nonzeros.
+
+                vector.Vector: If v is a Vector.
+        """
+        unit = v.get_unit_vector()
+        return unit * self.dot(unit)
+
+    get_projection_parallel_to = get_projection_on
+
+    def get_projection_orthogonal_to(self, v):
+        """Returns the component of this vector orthogonal to v.
+
+            Its nonzeros are those of self and v, so it is sparse if v is.
+        """
+        return self - self.get_projection_on(v)
+
+    def angle_with(self, v, inDegrees=False):
+        """Returns the angle between this vector and v.
+
+            Args:
+                v: A SparseVector or a vector.Vector.
+
+                inDegrees(bool): Return degrees instead of radians.
+
+            Raises:
+                ZeroDivisionError: If one of the vectors is zero.
+        """
+        cosine = self.dot(v) / (self.dot(self).sqrt() * v.dot(v).sqrt())
+        angle = math.acos(max(-1.0, min(1.0, float(cosine))))
+        return math.degrees(angle) if inDegrees else angle
+
+    def is_orthogonal_to(self, v, tolerance=None):
+        """Returns True if the dot product with v is zero, up to tolerance."""
+        return math_util.get_policy().is_zero_magnitude(abs(self.dot(v)), tolerance)
+
+    def is_parallel_to(self, v):
+        """Returns True if this vector and v are parallel. The zero vector is parallel to all."""
+        modules = self.module() * v.module()
+        return (self.is_zero() or v.is_zero()
+                or math_util.get_policy().isclose(abs(float(self.dot(v))), modules))
@@ -0,0 +1,47 @@
+import unittest
+from decimal import Decimal
+
+from vector import Vector
+from plane import Plane
+from lin_sys import LinearSystem
+from elimination_plan import EliminationPlan
+
+""""Elimination plan regression tests.
+
+Run them from the repository directory:
+
+    python -m unittest test_elimination_plan
+
+"""
+
+
+def system_of(rows):
+    return LinearSystem([Plane(Vector([str(c) for c in row[:-1]]), str(row[-1])) for row in rows])
+
+
+class ReplayTest(unittest.TestCase):
+
+    def record(self, rows):
+        system = system_of(rows)
+        plan = EliminationPlan(len(system), system.dimension)
+        system.compute_rref(plan)
+        return plan
+
+    def test_replay_matches_solve_on_same_system(self):
+        rows = [[1, 1, 1, 1], [2, 2, 3, 5], [3, 3, 4, 6]]
+        plan = self.record(rows)
+        system = system_of(rows)
+        self.assertEqual(system.solve(plan=plan), system.solve())
+
+    def test_skipped_column_nonzero_below_pivot_cell_falls_back(self):
+        # The recorded plan skips column 1 at row 1. In the new system the
+        # cell of row 1 is still zero after clearing, but row 2 is not.
+        plan = self.record([[1, 1, 1, 1], [2, 2, 3, 5], [3, 3, 4, 6]])
+        system = system_of([[1, 1, 1, 1], [2, 2, 3, 5], [3, 4, 4, 6]])
+
+        self.assertEqual(system.solve(), [Decimal(-2), Decimal(0), Decimal(3)])
+        self.assertEqual(system.solve(plan=plan), system.solve())
+
+
+if __name__ == '__main__':
+    unittest.main()
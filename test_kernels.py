@@ -0,0 +1,43 @@
+import unittest
+
+from vector import Vector
+from kernels import get_kernels, dot_rows, norm_rows
+
+""""Kernel regression tests.
+
+The Python kernels are always checked; the numba ones when they can be loaded.
+Run them from the repository directory:
+
+    python -m unittest test_kernels
+
+"""
+
+
+def kernel_sets():
+    import backends
+    names = ['python'] + (['numba'] if backends.is_available('numba_kernels') else [])
+    return [get_kernels(name) for name in names]
+
+
+class ReductionTest(unittest.TestCase):
+
+    def test_batched_reductions_match_vector(self):
+        us = [Vector(['3', '4', '0']), Vector(['1', '-2', '2'])]
+        vs = [Vector(['1', '1', '1']), Vector(['0', '1', '5'])]
+        for kernels in kernel_sets():
+            self.assertEqual(dot_rows(us, vs, kernels), [float(u.dot(v)) for u, v in zip(us, vs)])
+            self.assertEqual(norm_rows(us, kernels), [u.module() for u in us])
+
+    def test_single_reductions(self):
+        for kernels in kernel_sets():
+            u = kernels.as_vector([3, 4])
+            self.assertEqual(kernels.dot(u, u), 25.0)
+            self.assertEqual(kernels.norm(u), 5.0)
+
+    def test_batches_of_different_sizes(self):
+        with self.assertRaises(ValueError):
+            dot_rows([[1.0]], [[1.0], [2.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from copy import deepcopy
+from decimal import Decimal
+
+from vector import Vector
+from plane import Plane
+from lin_sys import LinearSystem
+
+""""LinearSystem regression tests.
+
+Run them from the repository directory:
+
+    python -m unittest test_lin_sys
+
+"""
+
+
+def diagonal_system():
+    return LinearSystem([Plane(Vector(['1', '0', '0']), '1'),
+                         Plane(Vector(['0', '1', '0']), '2'),
+                         Plane(Vector(['0', '0', '1']), '3')])
+
+
+class FactorizationCacheTest(unittest.TestCase):
+
+    def test_factorization_is_reused(self):
+        system = diagonal_system()
+        self.assertIs(system.factorize(), system.factorize())
+
+    def test_setting_a_normal_vector_refactorizes(self):
+        system = diagonal_system()
+        self.assertEqual(system.determinant(), 1)
+
+        system[0].normal_vector = Vector(['5', '0', '0'])
+
+        self.assertEqual(system.determinant(), 5)
+        self.assertEqual(system.solve(), [Decimal('0.2'), Decimal('2'), Decimal('3')])
+
+    def test_deepcopy_drops_the_factorization(self):
+        system = diagonal_system()
+        system.factorize()
+        self.assertIsNone(deepcopy(system)._factorization)
+
+
+if __name__ == '__main__':
+    unittest.main()
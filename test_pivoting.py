@@ -0,0 +1,50 @@
+import unittest
+
+from vector import Vector
+from hyperplane import Hyperplane
+from lin_sys import LinearSystem
+
+""""Pivoting regression tests.
+
+Run them from the repository directory:
+
+    python -m unittest test_pivoting
+
+"""
+
+
+MODES = [{}, {'pivoting': 'first_nonzero'}, {'pivoting': 'partial'}, {'pivoting': 'rook'},
+         {'pivoting': 'complete'}, {'equilibrate': True}]
+
+
+def system_of(rows):
+    return LinearSystem([Hyperplane(Vector([str(c) for c in row[:-1]]), str(row[-1])) for row in rows])
+
+
+class SolveFloatTest(unittest.TestCase):
+
+    def assert_every_mode_gives(self, system, expected):
+        for mode in MODES:
+            self.assertEqual(system.solve_float(**mode), expected, mode)
+
+    def test_determined_and_free_variables_give_false_like_solve(self):
+        system = system_of([[1, 0, 0, 1], [0, 1, 1, 2]])
+        self.assertIs(system.solve(), False)
+        self.assert_every_mode_gives(system, False)
+
+    def test_only_free_variables_give_true(self):
+        system = system_of([[1, 1, 0, 1], [0, 1, 1, 2]])
+        self.assertIs(system.solve(), True)
+        self.assert_every_mode_gives(system, True)
+
+    def test_unique_solution(self):
+        self.assert_every_mode_gives(system_of([[1, 1, 3], [1, -1, 1]]), [2.0, 1.0])
+
+    def test_eliminate_float_reports_growth_factor(self):
+        result = system_of([[1e-3, 1, 1], [1, 1, 2]]).eliminate_float('first_nonzero')
+        self.assertGreater(result.growth_factor, 100)
+        self.assertEqual(result.rank, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from math_util import get_policy, get_precision, using_policy, using_precision
+
+""""Thread pool batch solve documentation.
+
+Solves lin_sys.LinearSystem instances in a pool of threads, for services that
+solve requests concurrently. Every task carries its own Decimal precision and
+TolerancePolicy. They are set only for the thread running the task, while it
+runs, so tasks with different settings can run at the same time and the
+settings of a task never reach another one.
+
+A task whose precision or policy is None uses the one in use in the thread
+that submitted it, captured when it is submitted.
+
+Examples:
+    with ThreadPoolSolver(max_workers=8) as solver:
+        future = solver.submit(system, precision=50)
+        solution = future.result()
+
+        solutions = solver.solve([SolveTask(s1, 40, None), SolveTask(s2, 60, strict_policy)])
+
+"""
+
+
+SolveTask = namedtuple('SolveTask', ['system', 'precision', 'policy'])
+
+
+def solve_task(system, precision, policy, cache=None):
+    """Solves system with the given precision and policy in the current thread.
+
+        Args:
+            system(lin_sys.LinearSystem): The system to solve.
+
+            precision(int): The Decimal precision to use.
+
+            policy(math_util.TolerancePolicy): The tolerances to use.
+
+            cache(solve_cache.SolveCache): Passed to LinearSystem.solve.
+
+        Returns:
+            The result of LinearSystem.solve.
+    """
+    with using_precision(precision), using_policy(policy):
+        return system.solve(cache=cache)
+
+
+class ThreadPoolSolver(object):
+
+    def __init__(self, max_workers=None, cache=None):
+        """Initialize the solver and its threads.
+
+            Args:
+                max_workers(int): Number of threads. Defaults to the default of
+                                  concurrent.futures.ThreadPoolExecutor.
+
+                cache(solve_cache.SolveCache): A cache shared by all the tasks.
+                                               Its keys include the precision
+                                               and tolerance of each task.
+        """
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lin_sys')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Waits for the pending tasks and stops the threads."""
+        self._executor.shutdown(wait=True)
+
+    def submit(self, system, precision=None, policy=None):
+        """Schedules the solve of a system.
+
+            Args:
+                system(lin_sys.LinearSystem): The system to solve.
+
+                precision(int): The Decimal precision of the task.
+
+                policy(math_util.TolerancePolicy): The tolerances of the task.
+
+            Returns:
+                concurrent.futures.Future: Its result is the result of
+                                           LinearSystem.solve.
+        """
+        precision = get_precision() if precision is None else precision
+        policy = get_policy() if policy is None else policy
+        return self._executor.submit(solve_task, system, precision, policy, self.cache)
+
+    def solve(self, tasks):
+        """Solves a batch of tasks concurrently.
+
+            Args:
+                tasks(list): SolveTask instances, or systems to solve with the
+                             precision and policy of the caller.
+
+            Returns:
+                list: The results of LinearSystem.solve, in order.
+
+            Raises:
+                Exception: The first exception raised by a task.
+        """
+        futures = [self.submit(*task) if isinstance(task, SolveTask) else self.submit(task)
+                   for task in tasks]
+        return [future.result() for future in futures]
@@ -2,6 +2,8 @@
 """Vector class documentation.
 
 This class is a representation of a vector as described by lineal algebra.
+The arithmetic runs with the Decimal precision of math_util.get_precision(),
+whatever the precision of the caller's context.
 
 Example on how to instantiate:
     vector = Vector(['1.6','2','3'])
@@ -18,12 +20,14 @@ Attributes:
 
 import math
 import math_util
+from math_util import in_decimal_context
 from math import acos
 from decimal import Decimal
 
 
 class Vector(object):
     
+    ONLY_DEFINED_IN_MORE_THAN_TREE_DIM = 'The cross product is only defined in 2 and 3 dimensions'
     
     def __iter__(self):
         """Return the iterator for this vector's coordinates.
@@ -103,6 +107,7 @@ class Vector(object):
         """
         return self.coordinates == v.coordinates
 
+    @in_decimal_context
     def __add__(self, v):
         """Returns a new vector that is the addition of vector v with self.
         
@@ -114,11 +119,14 @@ class Vector(object):
                 self.
         
         """        
+        if not isinstance(v, Vector):
+            return v + self
         response = []
         for i, value in enumerate(self.coordinates):
             response.append(v.coordinates[i] + value)
         return Vector(response)
 
+    @in_decimal_context
     def __sub__(self, v):
         """Returns a new vector that is equals to subtracting v with self.
         
@@ -133,6 +141,7 @@ class Vector(object):
         neg = v * -1
         return self +neg
 
+    @in_decimal_context
     def __mul__(self, number):
         """Returns vector result of multiplying self with a scalar.
         
@@ -147,6 +156,7 @@ class Vector(object):
             response[i] = self.coordinates[i] * number;
         return Vector(response)
 
+    @in_decimal_context
     def dot(self, v):
         """Returns the dot product between this instance and another vector.
         
@@ -160,6 +170,8 @@ class Vector(object):
             ValueError: If the two vectors doesn't have the same length.
             
         """
+        if not isinstance(v, Vector):
+            return v.dot(self)
         if(len(self.coordinates) != len(v.coordinates)):
             raise ValueError("Vectors should have same length")
         result = 0
@@ -169,6 +181,7 @@ class Vector(object):
 
    
 
+    @in_decimal_context
     def get_unit_vector(self):
         """Returns a new instance with the the value of this instance's unit vector.
             
@@ -178,7 +191,7 @@ class Vector(object):
         Raises:
             ZeroDivisionError: Thrown if the module of self is zero.
         """
-        module = self.module()
+        module = self.dot(self).sqrt()
         return self * (1 / module)
     
     def module(self):
@@ -223,7 +236,7 @@ class Vector(object):
         """
         dotProduct = abs(self.dot(v))
         modulesMultiplacation = self.module() * v.module()
-        return (self.is_zero() or v.is_zero() or math_util.isclose(dotProduct, modulesMultiplacation))
+        return (self.is_zero() or v.is_zero() or math_util.get_policy().isclose(dotProduct, modulesMultiplacation))
     
     def get_projection_parallel_to(self, v):
         """Gets the horizontal component of the projection of self into v.
@@ -281,13 +294,14 @@ class Vector(object):
         return angleInRadians;
         
         
-    def is_orthogonal_to(self, v, tolerance=1e-10):
+    def is_orthogonal_to(self, v, tolerance=None):
         """Returns True if self and v are orthogonal.
         Args:
             v(vector.Vector): Will check if this vector and self are orthogonal
                 to each other.
                 
             tolerance(float): The minimum value that is considered zero.
+                Defaults to the magnitude_eps of math_util.get_policy().
         Returns:
             bool: True if self and v are orthogonal. False otherwise.
             
@@ -295,18 +309,19 @@ class Vector(object):
             ValueError: If the two vectors doesn't have the same length.
 
         """
-        return self.dot(v) <= tolerance
+        return math_util.get_policy().is_zero_magnitude(self.dot(v), tolerance)
 
-    def is_zero(self, tolerance=1e-10):
+    def is_zero(self, tolerance=None):
         """Return True if self is the zero vector.
             
         Args:
-            tolerance(float): Minimum value considered as zero.
+            tolerance(float): Minimum value considered as zero. Defaults to
+                the magnitude_eps of math_util.get_policy().
             
         Returns:
             bool: True if module is zero.
         """
-        return self.module() <= tolerance
+        return math_util.get_policy().is_zero_magnitude(self.module(), tolerance)
      
     
     def cross_product(self, v):     
@@ -320,32 +335,34 @@ class Vector(object):
             vector.Vector: Returns a vector that is orthogonal vector to self.
             
         Raises:
-            Exception: When the vectors are not specifically in 3 dimensions.
-        """
-        try:
-            x1, y1, z1 = self.coordinates
-            x2, y2, z2 = v.coordinates
+            Exception: When the vectors are not in 2 or 3 dimensions. 2D
+                vectors are taken as the 3D vectors with z = 0.
             
-            response = [y1 * z2 - y2 * z1,
-                      - (x1 * z2 - x2 * z1),
-                        x1 * y2 - x2 * y1
-                        ]
-            return Vector(response)
-        except ValueError as e:
-            msg = str(e)
-            if msg == "need more than 2 values to unpack":
-                v1 = Vector(self.coordinates + (0,))
-                v2 = Vector(v.coordinates + (0,))
-                return v1.cross_product(v2)
-            elif (msg == 'too many values to unpack' or
-                  msg == 'need more than 1 value to unpack'):
-                raise Exception(self.ONLY_DEFINED_IN_MORE_THAN_TREE_DIM)
-            else:
-                raise e
+            ValueError: If self and v doesn't have the same dimensions.
+        """
+        if self.dimension != v.dimension:
+            raise ValueError("Vectors should have same length")
+        if self.dimension == 2:
+            x1, y1 = self.coordinates
+            x2, y2 = v.coordinates
+            return Vector([0, 0, x1 * y2 - x2 * y1])
+        if self.dimension != 3:
+            raise Exception(self.ONLY_DEFINED_IN_MORE_THAN_TREE_DIM)
+        
+        x1, y1, z1 = self.coordinates
+        x2, y2, z2 = v.coordinates
+        response = [y1 * z2 - y2 * z1,
+                  - (x1 * z2 - x2 * z1),
+                    x1 * y2 - x2 * y1
+                    ]
+        return Vector(response)
         
         
     def area_of_parallelogram(self, v):
         """Return the area of the parallelogram formed by self and v.
+        
+        It is the module of the cross product. Vectors of more than 3 
+        dimensions use the equivalent sqrt(|self|^2 |v|^2 - (self . v)^2).
     
         Args: 
             v(vector.Vector): Vector that will produce the parallelogram with self.
@@ -354,8 +371,10 @@ class Vector(object):
             float: The area of the parallelogram.
                             
         """
-        angeleWith = self.angle_with(v)
-        return self.module() * v.module() * math.sin(angeleWith)
+        if self.dimension <= 3:
+            return self.cross_product(v).module()
+        dotProduct = self.dot(v)
+        return math.sqrt(max(self.dot(self) * v.dot(v) - dotProduct * dotProduct, 0))
     
     def area_of_triangle(self, v):
         """Return the area of one of the 2 triangles of the parallelogram. 
@@ -0,0 +1,212 @@
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+from vector import Vector
+from math_util import in_decimal_context
+
+""""Lazy vector expression documentation.
+
+Opt-in lazy arithmetic for vector.Vector. Wrapping vectors with lazy() makes
++, - and * build an expression tree instead of allocating a Vector per
+operator. evaluate() compiles the tree into one loop that computes every
+coordinate of the result in a single pass, so a + b * 3 - c reads each input
+coordinate once and allocates only the result.
+
+evaluate() runs with the Decimal precision of math_util.get_precision(), like
+the eager arithmetic of vector.Vector, so both give the same digits.
+
+Subexpressions that appear more than once in the tree, like (a + b) in
+(a + b) * 2 - (a + b), are computed once per coordinate. Compiled loops are
+kept per tree shape, up to COMPILED_CACHE_SIZE shapes evicting the least
+recently used, so evaluating the same expression on other vectors only runs
+the loop.
+
+Examples:
+    a, b, c = lazy(v1), lazy(v2), lazy(v3)
+
+    result = (a + b * 3 - c).evaluate()           # vector.Vector
+
+    buffer = [0] * v1.dimension
+    (a + b * 3 - c).evaluate(out=buffer)          # fills buffer, returns it
+
+"""
+
+
+COMPILED_CACHE_SIZE = 256
+
+
+class Expression(object):
+
+    DIFFERENT_DIMENSIONS_MSG = 'Vectors should have same length'
+    WRONG_OUT_SIZE_MSG = 'The output buffer must have a value per coordinate'
+    ONLY_VECTORS_ADDED_MSG = 'You can only add or subtract vectors.'
+    ONLY_NUMBERS_MULTIPLIED_MSG = 'You can only multiply vectors by numbers.'
+
+    _compiled = OrderedDict()
+    _compiled_lock = threading.Lock()
+
+    __slots__ = ('op', 'args', 'dimension', '_key')
+
+    def __init__(self, op, args, dimension):
+        self.op = op
+        self.args = args
+        self.dimension = dimension
+        self._key = None
+
+    def key(self):
+        """Returns a hashable key equal for structurally equal expressions.
+
+            Leaves are keyed by the identity of their vector and constants by
+            their value, so equal subtrees over the same vectors share a key.
+        """
+        if self._key is None:
+            if self.op == 'vector':
+                self._key = ('vector', id(self.args[0]))
+            elif self.op == 'const':
+                self._key = ('const', self.args[0])
+            else:
+                self._key = (self.op,) + tuple(arg.key() for arg in self.args)
+        return self._key
+
+    def __add__(self, other):
+        return self._binary('+', other)
+
+    def __radd__(self, other):
+        return _as_expression(other, self.dimension)._binary('+', self)
+
+    def __sub__(self, other):
+        return self._binary('-', other)
+
+    def __rsub__(self, other):
+        return _as_expression(other, self.dimension)._binary('-', self)
+
+    def __mul__(self, number):
+        return self._binary('*', number)
+
+    def __rmul__(self, number):
+        return _as_expression(number, self.dimension)._binary('*', self)
+
+    def __neg__(self):
+        return self._binary('*', -1)
+
+    def _binary(self, op, other):
+        other = _as_expression(other, self.dimension)
+        # Reflected operators call this on the number, so both sides are checked.
+        constants = (self.op == 'const') + (other.op == 'const')
+        if op != '*' and constants:
+            raise TypeError(self.ONLY_VECTORS_ADDED_MSG)
+        if op == '*' and constants != 1:
+            raise TypeError(self.ONLY_NUMBERS_MULTIPLIED_MSG)
+        if other.dimension is not None and self.dimension is not None and other.dimension != self.dimension:
+            raise ValueError(self.DIFFERENT_DIMENSIONS_MSG)
+        dimension = self.dimension if self.dimension is not None else other.dimension
+        return Expression(op, (self, other), dimension)
+
+    @in_decimal_context
+    def evaluate(self, out=None):
+        """Computes every coordinate of the expression in one pass.
+
+            Args:
+                out(list): A preallocated buffer with a value per coordinate.
+                           If provided the result is written into it.
+
+            Returns:
+                vector.Vector: The result, if out is not provided.
+
+                list: out, if it is provided.
+
+            Raises:
+                ValueError: If out doesn't have a value per coordinate.
+        """
+        vectors, constants, nodes = self._linearize()
+        function = self._compile(nodes)
+
+        if out is None:
+            return Vector(function(vectors, constants, [None] * self.dimension))
+        if len(out) != self.dimension:
+            raise ValueError(self.WRONG_OUT_SIZE_MSG)
+        return function(vectors, constants, out)
+
+    def _linearize(self):
+        # Topologically sort the unique subexpressions. Each node refers to
+        # its arguments by position; vectors and constants become inputs.
+        vectors, constants, nodes, positions = [], [], [], {}
+
+        def visit(expression):
+            key = expression.key()
+            if key in positions:
+                return positions[key]
+            if expression.op == 'vector':
+                node = ('vector', len(vectors))
+                vectors.append(expression.args[0].coordinates)
+            elif expression.op == 'const':
+                node = ('const', len(constants))
+                constants.append(expression.args[0])
+            else:
+                node = (expression.op,) + tuple(visit(arg) for arg in expression.args)
+            positions[key] = len(nodes)
+            nodes.append(node)
+            return positions[key]
+
+        visit(self)
+        return vectors, constants, nodes
+
+    @classmethod
+    def _compile(cls, nodes):
+        shape = tuple(nodes)
+        with cls._compiled_lock:
+            function = cls._compiled.get(shape)
+            if function is not None:
+                cls._compiled.move_to_end(shape)
+                return function
+
+        scalars = set(i for i, node in enumerate(nodes) if node[0] == 'const')
+        lines = []
+        for i, node in enumerate(nodes):
+            if node[0] == 'vector':
+                lines.append('        t{} = v{}[i]'.format(i, node[1]))
+            elif node[0] == 'const':
+                continue
+            else:
+                operands = ['c{}'.format(nodes[arg][1]) if arg in scalars else 't{}'.format(arg)
+                            for arg in node[1:]]
+                lines.append('        t{} = {} {} {}'.format(i, operands[0], node[0], operands[1]))
+
+        header = ['def fused(vectors, constants, out):']
+        header += ['    v{} = vectors[{}]'.format(i, i) for i in range(sum(1 for n in nodes if n[0] == 'vector'))]
+        header += ['    c{} = constants[{}]'.format(i, i) for i in range(len(scalars))]
+        header += ['    for i in range(len(out)):']
+        source = '\n'.join(header + lines + ['        out[i] = t{}'.format(len(nodes) - 1), '    return out'])
+
+        namespace = {}
+        exec(compile(source, '<vector_expr>', 'exec'), namespace)
+        function = namespace['fused']
+        with cls._compiled_lock:
+            cls._compiled[shape] = function
+            if len(cls._compiled) > COMPILED_CACHE_SIZE:
+                cls._compiled.popitem(last=False)
+        return function
+
+
+def _as_expression(value, dimension=None):
+    if isinstance(value, Expression):
+        return value
+    if isinstance(value, Vector):
+        return Expression('vector', (value,), value.dimension)
+    if isinstance(value, (int, float, Decimal)):
+        return Expression('const', (value,), None)
+    raise TypeError("You can only combine vectors and numbers.")
+
+
+def lazy(vector):
+    """Returns a lazy expression for vector.
+
+        Args:
+            vector(vector.Vector): The vector to wrap.
+
+        Returns:
+            Expression: Arithmetic on it builds an expression tree until
+                        evaluate is called.
+    """
+    return _as_expression(vector)
@@ -0,0 +1,372 @@
+import math
+from decimal import Decimal
+
+from vector import Vector
+from math_util import get_policy
+from matrix import Matrix
+
+""""Streaming vector statistics documentation.
+
+Reducers that summarise streams of vectors in constant memory: the sum and
+mean with the per coordinate variance (MeanVariance, with Welford's update),
+the covariance matrix (Covariance), the mean direction of the vectors
+(MeanDirection) and their bounding box (BoundingBox).
+
+The state of a reducer is a few lists of floats, so nothing is allocated per
+vector and no Decimal is converted back and forth. Vectors are consumed one
+at a time with update, or in chunks with update_batch. A chunk can be a list
+of vectors or of lists of numbers, or a numpy array of shape (k, dimension),
+which is reduced with array operations and merged into the state.
+
+Reducers with the same dimension can be merged with merge, so a stream can be
+split across threads or processes (reducers are picklable) and the partial
+results combined: merging gives the same result as feeding every vector to
+one reducer, up to rounding.
+
+Examples:
+    stats = MeanVariance()
+    for chunk in chunks:
+        stats.update_batch(chunk)
+    stats.mean()         # Vector
+    stats.variance()     # Vector
+
+    partials = executor.map(lambda chunk: Covariance().update_batch(chunk), chunks)
+    covariance = merge_all(partials).covariance()     # matrix.Matrix
+
+"""
+
+
+def _values(vector):
+    if isinstance(vector, Vector):
+        return [float(c) for c in vector.coordinates]
+    return [float(c) for c in vector]
+
+
+def _to_vector(values):
+    return Vector([Decimal(repr(value)) for value in values])
+
+
+def _is_array(batch):
+    return hasattr(batch, 'shape') and hasattr(batch, 'dtype')
+
+
+class Reducer(object):
+
+    DIFFERENT_DIMENSIONS_MSG = 'Vectors should have same length'
+    EMPTY_MSG = 'No vectors have been reduced'
+    DIFFERENT_REDUCERS_MSG = 'Only reducers of the same type can be merged'
+
+    def __init__(self):
+        self.count = 0
+        self.dimension = None
+
+    def _check_dimension(self, dimension):
+        if self.dimension is None:
+            self.dimension = dimension
+            self._start()
+        elif dimension != self.dimension:
+            raise ValueError(self.DIFFERENT_DIMENSIONS_MSG)
+
+    def _check_not_empty(self):
+        if not self.count:
+            raise Exception(self.EMPTY_MSG)
+
+    def update(self, vector):
+        """Adds a vector to the reduction.
+
+            Args:
+                vector(vector.Vector): The vector, or a list of numbers.
+
+            Returns:
+                Reducer: self.
+
+            Raises:
+                ValueError: If the vector doesn't have the dimension of the
+                            previous ones.
+        """
+        values = _values(vector)
+        self._check_dimension(len(values))
+        self._update(values)
+        return self
+
+    def update_batch(self, batch):
+        """Adds a chunk of vectors to the reduction.
+
+            Args:
+                batch: A list of vectors or of lists of numbers, or a numpy
+                       array of shape (k, dimension).
+
+            Returns:
+                Reducer: self.
+        """
+        if _is_array(batch):
+            if len(batch):
+                self._check_dimension(batch.shape[1])
+                self._update_array(batch.astype(float, copy=False))
+            return self
+        for vector in batch:
+            self.update(vector)
+        return self
+
+    def consume(self, vectors, chunked=False):
+        """Adds every vector of an iterable, or of an iterable of chunks.
+
+            Args:
+                vectors(iterable): The vectors, or the chunks if chunked is
+                                   True.
+
+                chunked(bool): If True every item is a chunk for update_batch.
+
+            Returns:
+                Reducer: self.
+        """
+        for item in vectors:
+            if chunked:
+                self.update_batch(item)
+            else:
+                self.update(item)
+        return self
+
+    def merge(self, other):
+        """Adds the vectors reduced by other to this reduction.
+
+            Args:
+                other(Reducer): A reducer of the same type.
+
+            Returns:
+                Reducer: self.
+
+            Raises:
+                ValueError: If other reduced vectors of another dimension.
+        """
+        if type(other) is not type(self):
+            raise TypeError(self.DIFFERENT_REDUCERS_MSG)
+        if other.dimension is not None:
+            self._check_dimension(other.dimension)
+        if other.count:
+            self._merge(other)
+        return self
+
+
+class MeanVariance(Reducer):
+    """Sum, mean and variance of every coordinate."""
+
+    def _start(self):
+        self._sum = [0.0] * self.dimension
+        self._mean = [0.0] * self.dimension
+        self._m2 = [0.0] * self.dimension
+
+    def _update(self, values):
+        self.count += 1
+        n = self.count
+        for i, x in enumerate(values):
+            self._sum[i] += x
+            delta = x - self._mean[i]
+            self._mean[i] += delta / n
+            self._m2[i] += delta * (x - self._mean[i])
+
+    def _combine(self, count, total, mean, m2):
+        # Chan et al. pairwise update of the mean and the sum of squared deviations.
+        n = self.count + count
+        for i in range(self.dimension):
+            delta = mean[i] - self._mean[i]
+            self._mean[i] += delta * count / n
+            self._m2[i] += m2[i] + delta * delta * self.count * count / n
+            self._sum[i] += total[i]
+        self.count = n
+
+    def _update_array(self, batch):
+        mean = batch.mean(axis=0)
+        self._combine(len(batch), batch.sum(axis=0).tolist(), mean.tolist(),
+                      ((batch - mean) ** 2).sum(axis=0).tolist())
+
+    def _merge(self, other):
+        self._combine(other.count, other._sum, other._mean, other._m2)
+
+    def sum(self):
+        """Returns the sum of the vectors as a Vector."""
+        self._check_not_empty()
+        return _to_vector(self._sum)
+
+    def mean(self):
+        """Returns the mean of the vectors, their centroid, as a Vector."""
+        self._check_not_empty()
+        return _to_vector(self._mean)
+
+    def variance(self, ddof=0):
+        """Returns the variance of every coordinate as a Vector.
+
+            Args:
+                ddof(int): The divisor is count - ddof. 1 gives the unbiased
+                           sample variance.
+        """
+        self._check_not_empty()
+        return _to_vector([m2 / (self.count - ddof) if self.count > ddof else 0.0 for m2 in self._m2])
+
+
+class Covariance(Reducer):
+    """Mean and covariance matrix of the vectors."""
+
+    def _start(self):
+        self._mean = [0.0] * self.dimension
+        self._comoment = [[0.0] * self.dimension for _ in range(self.dimension)]
+
+    def _update(self, values):
+        self.count += 1
+        n = self.count
+        before = [x - mean for x, mean in zip(values, self._mean)]
+        for i, delta in enumerate(before):
+            self._mean[i] += delta / n
+        after = [x - mean for x, mean in zip(values, self._mean)]
+        for i, delta in enumerate(before):
+            if delta:
+                row = self._comoment[i]
+                for j, other in enumerate(after):
+                    row[j] += delta * other
+
+    def _combine(self, count, mean, comoment):
+        n = self.count + count
+        delta = [b - a for a, b in zip(self._mean, mean)]
+        factor = self.count * count / n
+        for i in range(self.dimension):
+            row = self._comoment[i]
+            for j in range(self.dimension):
+                row[j] += comoment[i][j] + delta[i] * delta[j] * factor
+            self._mean[i] += delta[i] * count / n
+        self.count = n
+
+    def _update_array(self, batch):
+        mean = batch.mean(axis=0)
+        centered = batch - mean
+        self._combine(len(batch), mean.tolist(), (centered.T @ centered).tolist())
+
+    def _merge(self, other):
+        self._combine(other.count, other._mean, other._comoment)
+
+    def mean(self):
+        """Returns the mean of the vectors as a Vector."""
+        self._check_not_empty()
+        return _to_vector(self._mean)
+
+    def covariance(self, ddof=1):
+        """Returns the covariance matrix.
+
+            Args:
+                ddof(int): The divisor is count - ddof. Defaults to the sample
+                           covariance.
+
+            Returns:
+                matrix.Matrix: dimension x dimension.
+        """
+        self._check_not_empty()
+        divisor = self.count - ddof
+        return Matrix([[value / divisor if divisor > 0 else 0.0 for value in row] for row in self._comoment])
+
+
+class MeanDirection(Reducer):
+    """Mean of the unit vectors of the vectors. Zero vectors are skipped."""
+
+    NO_MEAN_DIRECTION_MSG = 'The unit vectors cancel out'
+
+    def __init__(self):
+        Reducer.__init__(self)
+        self.zero_vectors = 0
+
+    def _start(self):
+        self._sum = [0.0] * self.dimension
+
+    def _update(self, values):
+        norm = math.sqrt(sum(x * x for x in values))
+        if get_policy().is_zero_magnitude(norm):
+            self.zero_vectors += 1
+            return
+        self.count += 1
+        for i, x in enumerate(values):
+            self._sum[i] += x / norm
+
+    def _update_array(self, batch):
+        norms = (batch * batch).sum(axis=1) ** 0.5
+        nonzero = ~get_policy().is_zero_magnitude(norms)
+        self.zero_vectors += int(len(batch) - nonzero.sum())
+        self.count += int(nonzero.sum())
+        total = (batch[nonzero] / norms[nonzero][:, None]).sum(axis=0).tolist()
+        self._sum = [a + b for a, b in zip(self._sum, total)]
+
+    def merge(self, other):
+        # Only zero vectors is still a reduction, so they are counted even when other.count is 0.
+        Reducer.merge(self, other)
+        self.zero_vectors += other.zero_vectors
+        return self
+
+    def _merge(self, other):
+        self.count += other.count
+        self._sum = [a + b for a, b in zip(self._sum, other._sum)]
+
+    def resultant_length(self):
+        """Returns the length of the mean of the unit vectors, 1 if they all point the same way."""
+        self._check_not_empty()
+        return math.sqrt(sum(x * x for x in self._sum)) / self.count
+
+    def direction(self):
+        """Returns the unit vector of the mean direction.
+
+            Raises:
+                Exception: If the unit vectors cancel out.
+        """
+        self._check_not_empty()
+        norm = math.sqrt(sum(x * x for x in self._sum))
+        if get_policy().is_zero_magnitude(norm):
+            raise Exception(self.NO_MEAN_DIRECTION_MSG)
+        return _to_vector([x / norm for x in self._sum])
+
+
+class BoundingBox(Reducer):
+    """Minimum and maximum of every coordinate."""
+
+    def _start(self):
+        self._min = [math.inf] * self.dimension
+        self._max = [-math.inf] * self.dimension
+
+    def _update(self, values):
+        self.count += 1
+        self._min = [min(a, b) for a, b in zip(self._min, values)]
+        self._max = [max(a, b) for a, b in zip(self._max, values)]
+
+    def _update_array(self, batch):
+        self.count += len(batch)
+        self._min = [min(a, b) for a, b in zip(self._min, batch.min(axis=0).tolist())]
+        self._max = [max(a, b) for a, b in zip(self._max, batch.max(axis=0).tolist())]
+
+    def _merge(self, other):
+        self.count += other.count
+        self._min = [min(a, b) for a, b in zip(self._min, other._min)]
+        self._max = [max(a, b) for a, b in zip(self._max, other._max)]
+
+    def minimum(self):
+        """Returns the minimum of every coordinate as a Vector."""
+        self._check_not_empty()
+        return _to_vector(self._min)
+
+    def maximum(self):
+        """Returns the maximum of every coordinate as a Vector."""
+        self._check_not_empty()
+        return _to_vector(self._max)
+
+    def contains(self, vector):
+        """Returns True if vector is inside the box, borders included."""
+        self._check_not_empty()
+        return all(low <= x <= high for low, x, high in zip(self._min, _values(vector), self._max))
+
+
+def merge_all(reducers):
+    """Returns one reducer with the vectors of all of them.
+
+        Args:
+            reducers(iterable[Reducer]): Reducers of the same type. The first
+                                         one is updated and returned.
+    """
+    reducers = iter(reducers)
+    result = next(reducers)
+    for reducer in reducers:
+        result.merge(reducer)
+    return result